@@ -0,0 +1,103 @@
+import os
+
+import numpy as np
+
+MASK = (1 << 64) - 1
+
+# kinds of the hashed state and action features
+STATE_QUANTIZE = 0
+TASK_TYPE = 1
+TASK_ASSIGNMENT = 2
+ACTION = 3
+
+
+def feature_key(position: int, kind: int, value: int) -> int:
+    '''
+    Returns the 64-bit Zobrist key of one feature. The keys come from a fixed splitmix64 mix instead of a random
+    table, so they are the same on every run.
+    '''
+    x = (position * 0x9E3779B97F4A7C15 + kind * 0xC2B2AE3D27D4EB4F + value * 0x165667B19E3779F9
+         + 0x27D4EB2F165667C5) & MASK
+    x = ((x ^ (x >> 30)) * 0xBF58476D1CE4E5B9) & MASK
+    x = ((x ^ (x >> 27)) * 0x94D049BB133111EB) & MASK
+    return x ^ (x >> 31)
+
+
+class QTable:
+    '''
+    Fixed-size, set-associative table of Q-values keyed by 64-bit (state, action) keys. Missing entries read as 0
+    and a full set evicts its least visited entry, so the memory stays flat however many states are seen.
+    '''
+
+    def __init__(self, size: int | None = None, ways: int = 8):
+        if size is None:
+            size = int(os.environ.get('Q_TABLE_SIZE', 65536))
+        self.ways = ways
+        self.sets = max(size // ways, 1)
+        self.keys = np.zeros(self.sets * ways, dtype=np.uint64)
+        self.values = np.zeros(self.sets * ways, dtype=np.float64)
+        # 0 marks an empty entry
+        self.visits = np.zeros(self.sets * ways, dtype=np.uint32)
+        # key -> entry index, never larger than the table itself
+        self.entries: dict[int, int] = {}
+        # key -> value before its first change, while the changes are tracked
+        self.changes: dict[int, float] | None = None
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def get(self, key: int) -> float:
+        entry = self.entries.get(key)
+        if entry is None:
+            return 0.0
+        return self.values.item(entry)
+
+    def get_many(self, keys: np.ndarray) -> np.ndarray:
+        '''
+        Looks up an array of keys at once by comparing them against every entry of their sets.
+        '''
+        entries = (keys % np.uint64(self.sets)).astype(np.int64)[:, None] * self.ways + np.arange(self.ways)
+        found = (self.keys[entries] == keys[:, None]) & (self.visits[entries] > 0)
+        # a key is stored at most once, so at most one entry per row is found
+        return np.where(found, self.values[entries], 0.0).sum(axis=1)
+
+    def set(self, key: int, value: float):
+        key = int(key)
+        if self.changes is not None and key not in self.changes:
+            self.changes[key] = self.get(key)
+        entry = self.entries.get(key)
+        if entry is None:
+            # an empty entry of the set if there is one, otherwise its least visited entry
+            first = (key % self.sets) * self.ways
+            entry = first + int(np.argmin(self.visits[first:first + self.ways]))
+            if self.visits[entry] > 0:
+                del self.entries[int(self.keys[entry])]
+            self.entries[key] = entry
+            self.keys[entry] = key
+            self.visits[entry] = 0
+        self.values[entry] = value
+        self.visits[entry] += 1
+
+    def load(self, keys: np.ndarray, values: np.ndarray, visits: np.ndarray):
+        '''
+        Fills the table with the entries of another one, re-inserting them when the other table has another size.
+        '''
+        self.clear()
+        if keys.shape == self.keys.shape:
+            self.keys[:] = keys
+            self.values[:] = values
+            self.visits[:] = visits
+            for entry in np.flatnonzero(self.visits):
+                self.entries[int(self.keys[entry])] = int(entry)
+            return
+
+        for entry in np.flatnonzero(visits):
+            key = int(keys[entry])
+            self.set(key, float(values[entry]))
+            self.visits[self.entries[key]] = visits[entry]
+
+    def clear(self):
+        self.keys.fill(0)
+        self.values.fill(0)
+        self.visits.fill(0)
+        self.entries.clear()
@@ -0,0 +1,45 @@
+import math
+
+
+class RunningStats:
+    '''
+    Welford mean and sum of squared deviations of a window of values that grows, shrinks and has values replaced.
+    '''
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    def add(self, value: float):
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+
+    def remove(self, value: float):
+        if self.count <= 1:
+            self.clear()
+            return
+        delta = value - self.mean
+        self.count -= 1
+        self.mean -= delta / self.count
+        self.m2 = max(self.m2 - delta * (value - self.mean), 0.0)
+
+    def replace(self, old_value: float, new_value: float):
+        old_mean = self.mean
+        self.mean += (new_value - old_value) / self.count
+        self.m2 = max(self.m2 + (new_value - old_value) * (new_value - self.mean + old_value - old_mean), 0.0)
+
+    def deviation(self) -> float:
+        '''
+        Returns the square root of the sum of squared deviations, with rounding residue of equal values taken as 0.
+        '''
+        if self.m2 < 1e-12:
+            return 0.0
+        return math.sqrt(self.m2)
+
+    def clear(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
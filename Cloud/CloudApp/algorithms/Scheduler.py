@@ -1,9 +1,18 @@
+import copy
+import heapq
 import math
+import multiprocessing
+import os
 import random
+import tempfile
 import time
-from threading import Lock
-from typing import Tuple
+from concurrent.futures import ProcessPoolExecutor
+from threading import Lock, Event
 
+import numpy as np
+
+from .QTable import QTable, feature_key, STATE_QUANTIZE, TASK_TYPE, TASK_ASSIGNMENT, ACTION
+from .RunningStats import RunningStats
 from ..types.PreemptionType import PreemptionType
 from ..types.Processor import Processor
 from ..types.SubTask import SubTask, TaskType
@@ -14,17 +23,28 @@ class Scheduler:
         self.processors = processors
         self.start_time: float | None = None
         self.time_scale: float = time_scale
+        # wall clock in seconds, replaced by a virtual clock in simulation
+        self.clock = time.time
         self.tasks: list[SubTask] = []
         self.ready_tasks_lock = Lock()
-        self.ready_tasks = []
+        # set on every arrival so an idle scheduling thread wakes up
+        self.wakeup = Event()
+        # task index -> None, in arrival order
+        self.ready_tasks: dict[int, None] = {}
+        # [0: end time, 1: task index] of the placed ready tasks waiting to be notified
+        self.completion_heap: list[tuple[int, int]] = []
         self.preemption_type: PreemptionType = preemption_type
         self.need_schedule = False
 
-        self.q_table = {}
+        self.q_table = QTable()
         self.last_rewards = []
         self.last_rewards_index = 0
         self.last_rewards_total = 100
-        self.action_n = {}
+        self.last_rewards_stats = RunningStats()
+        self.action_keys = np.zeros(0, dtype=np.uint64)
+        self.assignment_keys = np.zeros(0, dtype=np.uint64)
+        self.action_n = np.zeros(0, dtype=np.int64)
+        self.task_type_values = {task_type: i for i, task_type in enumerate(TaskType)}
 
         self.alpha = 0.1  # Learning rate
         self.gamma = 0.9  # Discount factor
@@ -33,10 +53,44 @@ class Scheduler:
         self.epsilon_min = 0.2
         self.num_episodes = 10  # Episode Numbers
         self.lam = 1.0  # Adaptive parameter
+        self.rollout_workers = int(os.environ.get('RL_WORKERS', 1))  # processes running the episodes
+        # fewest ready tasks a round needs to run its episodes in the workers, below it the messages cost more than
+        # the episodes
+        self.parallel_min_tasks = int(os.environ.get('RL_PARALLEL_MIN_TASKS', 32))
+        # one single-process pool per worker, so every worker keeps its copy of the Q-table between rounds
+        self.rollout_pools: list[ProcessPoolExecutor] = []
+        # per worker: key -> merged Q-value the worker has not received yet
+        self.rollout_updates: list[dict[int, float]] = []
+        # wall-clock budget of a planning round in milliseconds, 0 for none; a round runs at least one episode
+        self.round_budget = float(os.environ.get('RL_ROUND_BUDGET', 0))
+        self.round_episodes = 0  # episodes run in the last round
+        # episodes run per round over the run, with the fewest and the most
+        self.round_episodes_stats = RunningStats()
+        self.round_episodes_min = 0
+        self.round_episodes_max = 0
+        # file the learned state is saved to at the end of a run and warm-started from
+        self.snapshot_path: str | None = device_snapshot_path(os.environ.get('ADDRESS', 'cloud'))
 
         self.reward_qos_sensitivity = 1.0
         self.reward_deadline_sensitivity = 1.0
         self.reward_qos_values: list[float] = []
+        self.reward_qos_stats = RunningStats()
+
+        # mutations of the current episode to roll back: [0: task, 1: processor, or None when offloaded,
+        # 2: remaining execution cost of the task before the action]
+        self.undo_log: list[tuple[SubTask, Processor | None, int]] = []
+
+        # reward aggregates of the ready tasks placed so far in the current episode, and of the ready tasks placed
+        # before the round which every episode starts from
+        self.episode_qos = 0.0
+        self.episode_reward_deadline = 0.0
+        self.episode_max_d = 0.0
+        self.episode_min_d = math.inf
+        self.episode_max_d_reward = -math.inf
+        self.episode_min_d_reward = math.inf
+        self.ready_task_count = 0
+        self.round_rewards: tuple[float, float, float, float, float, float] = (
+            0.0, 0.0, 0.0, math.inf, -math.inf, math.inf)
 
     def clear(self):
         self.ready_tasks_lock.acquire()
@@ -44,11 +98,14 @@ class Scheduler:
         for processor in self.processors:
             processor.clear()
         self.ready_tasks.clear()
+        self.completion_heap.clear()
 
         self.need_schedule = False
 
         self.q_table.clear()
-        self.action_n.clear()
+        self.action_n.fill(0)
+        # the workers hold the previous Q-table, new ones start from the cleared or loaded one
+        self.shutdown()
 
         self.alpha = 0.1
         self.gamma = 0.9
@@ -61,233 +118,488 @@ class Scheduler:
         self.reward_qos_sensitivity = 1.0
         self.reward_deadline_sensitivity = 1.0
         self.reward_qos_values.clear()
+        self.reward_qos_stats.clear()
+        self.round_episodes_stats.clear()
+        self.round_episodes_min = 0
+        self.round_episodes_max = 0
+
+        if self.snapshot_path is not None and os.path.exists(self.snapshot_path):
+            self.load_snapshot()
 
         self.ready_tasks_lock.release()
 
     def add_task(self, new_task: SubTask):
+        self.add_tasks([new_task])
+
+    def add_tasks(self, new_tasks: list[SubTask]):
         self.ready_tasks_lock.acquire()
         self.need_schedule = True
-        new_task.index = len(self.tasks)
-        self.tasks.append(new_task)
-        new_task.arrival_time = int((time.time() - self.start_time) * self.time_scale * 1000)
-        new_task.absolute_deadline = int((new_task.absolute_deadline_time - self.start_time) * self.time_scale * 1000)
-        self.ready_tasks.append(new_task.index)
+        arrival_time = int((self.clock() - self.start_time) * self.time_scale * 1000)
+        for new_task in new_tasks:
+            new_task.index = len(self.tasks)
+            self.tasks.append(new_task)
+            new_task.arrival_time = arrival_time
+            new_task.absolute_deadline = int((new_task.absolute_deadline_time - self.start_time)
+                                             * self.time_scale * 1000)
+            self.ready_tasks[new_task.index] = None
         self.ready_tasks_lock.release()
+        self.wakeup.set()
 
-    def schedule(self, current_time: int, total_time: int):
+    def schedule(self, current_time: int, total_time: int) -> float:
         if current_time > total_time:
             print(".", end="")
 
         self.ready_tasks_lock.acquire()
 
         if self.need_schedule:
-            self.schedule_rl(current_time)
             self.need_schedule = False
+            self.schedule_rl(current_time)
 
-        i = 0
-        while True:
-            if i >= len(self.ready_tasks):
-                break
-            task = self.tasks[self.ready_tasks[i]]
-            if task.remaining_execution_cost == 0 and task.execution_times[-1][2] <= current_time:
-                task.edge.notify(task.id, task.workflow_id, task.job_id)
-                del self.ready_tasks[i]
-            else:
-                i += 1
+        while len(self.completion_heap) > 0 and self.completion_heap[0][0] <= current_time:
+            end_time, task_index = heapq.heappop(self.completion_heap)
+            task = self.tasks[task_index]
+            task.edge.notify(task.id, task.workflow_id, task.job_id)
+            del self.ready_tasks[task_index]
+
+        next_event_time = math.inf
+        if len(self.completion_heap) > 0:
+            next_event_time = min(next_event_time, self.completion_heap[0][0])
 
         self.ready_tasks_lock.release()
 
+        return next_event_time
+
     def schedule_rl(self, current_time: int):
-        print("Q-Table size: ", len(self.q_table))
+        '''
+        Plans the ready tasks that are not placed yet. With RL_WORKERS above 1 the episodes of a round of at least
+        RL_PARALLEL_MIN_TASKS tasks run in worker processes and ready_tasks_lock, which schedule holds, is released
+        until they finish.
+        '''
         state_quantize = len(self.ready_tasks) % len(self.processors)
 
-        for episode in range(self.num_episodes):
+        ready_tasks_index = [
+            task_index for task_index in self.ready_tasks if len(self.tasks[task_index].execution_times) == 0
+        ]
+        ready_tasks_type = [self.tasks[task_index].task_type for task_index in ready_tasks_index]
+        self.extend_actions(len(ready_tasks_index))
+        self.start_environment()
+
+        deadline = None
+        if self.round_budget > 0:
+            deadline = time.perf_counter() + self.round_budget / 1000
+
+        if self.rollout_workers > 1 and len(ready_tasks_index) >= max(self.parallel_min_tasks, 1):
+            if not self.run_parallel_episodes(current_time, ready_tasks_index, ready_tasks_type, state_quantize,
+                                              deadline):
+                return
+        else:
+            if len(self.rollout_pools) > 0:
+                self.q_table.changes = {}
+            _, self.round_episodes, _ = self.run_episodes(self.num_episodes, current_time, ready_tasks_index,
+                                                          ready_tasks_type, state_quantize, deadline)
+            if self.q_table.changes is not None:
+                # the workers take the values changed in this process with their next round
+                for q_updates in self.rollout_updates:
+                    for key in self.q_table.changes:
+                        q_updates[key] = self.q_table.get(key)
+                self.q_table.changes = None
+
+        if self.round_episodes_stats.count == 0 or self.round_episodes < self.round_episodes_min:
+            self.round_episodes_min = self.round_episodes
+        self.round_episodes_max = max(self.round_episodes_max, self.round_episodes)
+        self.round_episodes_stats.add(self.round_episodes)
+
+        # keep the placements of the last episode
+        for task, _, _ in self.undo_log:
+            heapq.heappush(self.completion_heap, (task.execution_times[-1][2], task.index))
+        self.undo_log.clear()
+
+    def run_episodes(self, episodes: int, current_time: int, ready_tasks_index: list[int],
+                     ready_tasks_type: list[TaskType], state_quantize: int,
+                     deadline: float | None) -> (list[int], int, float):
+        '''
+        Runs the episodes one after the other and keeps the placements of the last one. With a deadline (a
+        perf_counter time) it stops starting episodes once the deadline has passed and keeps the placements of the
+        episode with the highest total reward instead. Returns the kept actions, the number of episodes run and the
+        kept total reward.
+        '''
+        episode_actions, episode_reward = [], -math.inf
+        best_actions, best_reward = [], -math.inf
+        episode = 0
+        while episode < episodes:
+            if episode > 0 and deadline is not None and time.perf_counter() >= deadline:
+                break
+
             self.reset_environment()
+            episode_actions, episode_reward = self.run_episode(current_time, ready_tasks_index, ready_tasks_type,
+                                                               state_quantize)
+            if episode_reward > best_reward:
+                best_actions, best_reward = episode_actions, episode_reward
+            episode += 1
 
-            ready_tasks_index = [
-                task_index for task_index in self.ready_tasks if len(self.tasks[task_index].execution_times) == 0
-            ]
-            ready_tasks_type = [self.tasks[task_index].task_type for task_index in ready_tasks_index]
-            ready_tasks_processor: list[int | None] = [None for _ in ready_tasks_index]
+            # Decay epsilon after each episode
+            self.epsilon = max(self.epsilon * self.epsilon_decay, self.epsilon_min)
 
-            state = (tuple(ready_tasks_type), tuple(ready_tasks_processor), state_quantize)
+        if deadline is None or best_actions is episode_actions:
+            return episode_actions, episode, episode_reward
 
-            while not self.is_terminal_state(state):
+        # replay the best episode
+        self.reset_environment()
+        for action in best_actions:
+            self.take_action(current_time, ready_tasks_index, action)
+        return best_actions, episode, best_reward
 
-                # 0: ready task index, 1: processor index
-                action: Tuple[int, int] | None = None
-                actions = self.get_actions(state)
+    def run_episode(self, current_time: int, ready_tasks_index: list[int], ready_tasks_type: list[TaskType],
+                    state_quantize: int) -> (list[int], float):
+        episode_actions = []
+        episode_reward = 0.0
 
-                # Epsilon-greedy action selection
-                if random.uniform(0, 1) < self.epsilon:
-                    # Exploration: choose a random action
-                    action = self.random_action(actions)
-                else:
-                    # Exploitation: choose the action with the highest Q-value
-                    action = self.ucb_action(state, actions, current_time)
+        # action = ready task index * len(processors) + processor index; the state is the set of actions left
+        # and its key
+        actions = np.arange(len(ready_tasks_index) * len(self.processors))
+        state_key = self.state_key(ready_tasks_type, state_quantize)
 
-                if action not in self.action_n:
-                    self.action_n[action] = 1
-                else:
-                    self.action_n[action] += 1
-
-                # take the action
-                task = self.tasks[ready_tasks_index[action[0]]]
-                selected_processor = self.processors[action[1]]
-                execution_time = selected_processor.get_execution_time(task.remaining_execution_cost)
-                start_time = current_time
-                if len(selected_processor.temp_allocations) > 0:
-                    start_time = max(start_time, selected_processor.temp_allocations[-1][2])
-                selected_processor.temp_allocations.append([task.index, start_time, start_time + execution_time])
-                task.temp_execution_times.append([action[1], start_time, start_time + execution_time])
-                task.temp_remaining_execution_cost = 0
-
-                reward = self.calculate_reward()
-
-                # Define next state
-                ready_tasks_processor[action[0]] = action[1]
-
-                next_state = (tuple(ready_tasks_type), tuple(ready_tasks_processor), state_quantize)
-                next_state_actions = self.get_actions(next_state)
-
-                # Find max Q-value for next state
-                next_q_values = [self.q_table[(next_state, a)] for a in next_state_actions]
-                current_q = self.q_table[(state, action)]
-
-                if len(next_q_values) > 0:
-                    max_next_q = max(next_q_values)
-                    # Update Q-value for the current state and action
-                    self.q_table[(state, action)] = current_q + self.alpha * (
-                            reward + self.gamma * max_next_q - current_q
-                    )
-                else:
-                    self.q_table[(state, action)] = current_q + self.alpha * reward
+        while not self.is_terminal_state(actions):
 
-                # go to next state
-                state = next_state
+            # Epsilon-greedy action selection
+            if random.uniform(0, 1) < self.epsilon:
+                # Exploration: choose a random action
+                action = self.random_action(actions)
+            else:
+                # Exploitation: choose the action with the highest Q-value
+                action = self.ucb_action(state_key, actions, current_time)
+
+            self.action_n[action] += 1
+            episode_actions.append(int(action))
+
+            # take the action
+            task = self.take_action(current_time, ready_tasks_index, action)
+            reward = self.calculate_reward(task)
+            episode_reward += reward
+
+            # Define next state
+            next_actions = actions[actions // len(self.processors) != action // len(self.processors)]
+            next_state_key = state_key ^ self.assignment_keys[action]
+
+            # Find max Q-value for next state
+            next_q_values = self.q_table.get_many(next_state_key ^ self.action_keys[next_actions])
+            current_q = self.q_table.get(state_key ^ self.action_keys[action])
+
+            if len(next_q_values) > 0:
+                max_next_q = next_q_values.max()
+                # Update Q-value for the current state and action
+                self.q_table.set(state_key ^ self.action_keys[action], current_q + self.alpha * (
+                        reward + self.gamma * max_next_q - current_q
+                ))
+            else:
+                self.q_table.set(state_key ^ self.action_keys[action], current_q + self.alpha * reward)
 
-                # update last rewards
-                if len(self.last_rewards) == 0:
-                    self.last_rewards = [reward for _ in range(self.last_rewards_total)]
-                else:
-                    self.last_rewards[self.last_rewards_index] = reward
+            # go to next state
+            actions = next_actions
+            state_key = next_state_key
 
-                self.last_rewards_index += 1
-                if self.last_rewards_index == self.last_rewards_total:
-                    self.last_rewards_index = 0
+            # update last rewards
+            if len(self.last_rewards) == 0:
+                self.last_rewards = [reward for _ in range(self.last_rewards_total)]
+                for _ in range(self.last_rewards_total):
+                    self.last_rewards_stats.add(reward)
+            else:
+                self.last_rewards_stats.replace(self.last_rewards[self.last_rewards_index], reward)
+                self.last_rewards[self.last_rewards_index] = reward
+
+            self.last_rewards_index += 1
+            if self.last_rewards_index == self.last_rewards_total:
+                self.last_rewards_index = 0
+
+            # update the lambda
+            self.update_lambda()
+
+        return episode_actions, episode_reward
+
+    def take_action(self, current_time: int, ready_tasks_index: list[int], action: int) -> SubTask:
+        ready_task_index, processor_index = divmod(int(action), len(self.processors))
+        task = self.tasks[ready_tasks_index[ready_task_index]]
+        selected_processor = self.processors[processor_index]
+        execution_time = selected_processor.get_execution_time(task.remaining_execution_cost)
+        start_time = current_time
+        if len(selected_processor.allocations) > 0:
+            start_time = max(start_time, selected_processor.allocations[-1][2])
+        self.undo_log.append((task, selected_processor, task.remaining_execution_cost))
+        selected_processor.allocations.append([task.index, start_time, start_time + execution_time])
+        task.execution_times.append([processor_index, start_time, start_time + execution_time])
+        task.remaining_execution_cost = 0
+
+        return task
+
+    def run_parallel_episodes(self, current_time: int, ready_tasks_index: list[int], ready_tasks_type: list[TaskType],
+                              state_quantize: int, deadline: float | None) -> bool:
+        '''
+        Splits the episodes over worker processes that run them on snapshots of the scheduler, then adds up their
+        Q-value and visit count changes and replays the episode kept by the last worker, or with a deadline the best
+        episode kept by any worker. The workers receive the whole Q-table once and keep it, every round only sends
+        them the merged values of the keys changed since. Returns False if the scheduler was cleared while the lock
+        was released.
+        '''
+        if len(self.rollout_pools) == 0:
+            for worker in range(self.rollout_workers):
+                self.rollout_pools.append(ProcessPoolExecutor(max_workers=1,
+                                                              mp_context=rollout_context(),
+                                                              initializer=start_rollout_worker,
+                                                              initargs=(self.q_table,)))
+                self.rollout_updates.append({})
+
+        # perf_counter values of this process mean nothing in the workers, they get the time left instead
+        budget = None
+        if deadline is not None:
+            budget = max(deadline - time.perf_counter(), 0)
+
+        workers = min(self.rollout_workers, self.num_episodes)
+        snapshot = self.rollout_snapshot(ready_tasks_index)
+        futures = []
+        for worker in range(workers):
+            episodes = self.num_episodes // workers + (1 if worker < self.num_episodes % workers else 0)
+            q_updates = list(self.rollout_updates[worker].items())
+            self.rollout_updates[worker] = {}
+            futures.append(self.rollout_pools[worker].submit(run_rollout, snapshot, q_updates, episodes, current_time,
+                                                              ready_tasks_type, state_quantize, budget,
+                                                              random.getrandbits(32)))
+
+        round_tasks = [self.tasks[task_index] for task_index in ready_tasks_index]
+        self.ready_tasks_lock.release()
+        try:
+            results = [future.result() for future in futures]
+        finally:
+            self.ready_tasks_lock.acquire()
 
-                # update the lambda
-                self.update_lambda()
+        for task in round_tasks:
+            if task.index >= len(self.tasks) or self.tasks[task.index] is not task:
+                return False
 
-            # Decay epsilon after each episode
+        self.round_episodes = 0
+        changed_keys: set[int] = set()
+        for q_changes, action_n_changes, episodes, *_ in results:
+            for key, change in q_changes:
+                self.q_table.set(key, self.q_table.get(key) + change)
+                changed_keys.add(key)
+            self.action_n += action_n_changes
+            self.round_episodes += episodes
+
+        # a worker only has its own changes, it takes the merged values with its next round
+        for q_updates in self.rollout_updates:
+            for key in changed_keys:
+                q_updates[key] = self.q_table.get(key)
+
+        for episode in range(self.round_episodes):
             self.epsilon = max(self.epsilon * self.epsilon_decay, self.epsilon_min)
 
-        for processor in self.processors:
-            processor.apply_cache()
+        kept_result = results[-1]
+        if deadline is not None:
+            kept_result = max(results, key=lambda result: result[4])
 
-        for task_index in self.ready_tasks:
-            task = self.tasks[task_index]
-            task.apply_cache()
-
-    def is_terminal_state(self, state: Tuple):
-        for ready_task_processor in state[1]:
-            if ready_task_processor is None:
-                return False
+        (episode_actions, episode_reward, self.lam, self.last_rewards, self.last_rewards_index,
+         self.last_rewards_stats, self.reward_qos_values, self.reward_qos_stats, self.reward_qos_sensitivity,
+         self.reward_deadline_sensitivity) = kept_result[3:]
+        for action in episode_actions:
+            self.take_action(current_time, ready_tasks_index, action)
 
         return True
 
-    def get_actions(self, state: Tuple):
-        actions = []
-
-        for i in range(len(state[0])):
-            if state[1][i] is None:
-                for processor_index in range(len(self.processors)):
-                    action = (i, processor_index)
-                    actions.append(action)
-                    if (state, action) not in self.q_table:
-                        self.q_table[(state, action)] = 0.0
-                    if action not in self.action_n:
-                        self.action_n[action] = 0
-
-        return actions
-
-    def random_action(self, actions: list):
+    def rollout_snapshot(self, ready_tasks_index: list[int]) -> 'Scheduler':
+        '''
+        Returns a copy of the scheduler for the workers with only the ready tasks to place, the last allocation of
+        every processor and no lock, wakeup event, Q-table or worker pools.
+        '''
+        snapshot = copy.copy(self)
+        snapshot.ready_tasks_lock = None
+        snapshot.wakeup = None
+        snapshot.q_table = None
+        snapshot.rollout_pools = []
+        snapshot.rollout_updates = []
+        snapshot.undo_log = []
+
+        snapshot.processors = []
+        for processor in self.processors:
+            processor_snapshot = copy.copy(processor)
+            processor_snapshot.allocations = processor.allocations[-1:]
+            snapshot.processors.append(processor_snapshot)
+
+        snapshot.tasks = []
+        for task_index in ready_tasks_index:
+            task_snapshot = copy.copy(self.tasks[task_index])
+            task_snapshot.edge = None
+            task_snapshot.index = len(snapshot.tasks)
+            task_snapshot.execution_times = []
+            snapshot.tasks.append(task_snapshot)
+        snapshot.ready_tasks = {task.index: None for task in snapshot.tasks}
+        snapshot.completion_heap = []
+
+        return snapshot
+
+    def is_terminal_state(self, actions: np.ndarray):
+        return len(actions) == 0
+
+    def state_key(self, ready_tasks_type: list[TaskType], state_quantize: int) -> np.uint64:
+        '''
+        Hashes the state before any action into a 64-bit key by xor-ing the keys of its features, so that taking an
+        action only swaps the assignment feature of one task.
+        '''
+        key = feature_key(-1, STATE_QUANTIZE, state_quantize)
+        for i in range(len(ready_tasks_type)):
+            key ^= feature_key(i, TASK_TYPE, self.task_type_values[ready_tasks_type[i]])
+            key ^= feature_key(i, TASK_ASSIGNMENT, 0)
+        return np.uint64(key)
+
+    def extend_actions(self, task_count: int):
+        '''
+        Grows the per-action visit counts, action keys and assignment keys to cover task_count ready tasks.
+        '''
+        known_task_count = len(self.action_keys) // len(self.processors)
+        if task_count <= known_task_count:
+            return
+
+        action_keys = []
+        assignment_keys = []
+        for i in range(known_task_count, task_count):
+            for processor_index in range(len(self.processors)):
+                # 0: not assigned, otherwise processor index + 1
+                action_keys.append(feature_key(i, ACTION, processor_index + 1))
+                assignment_keys.append(
+                    feature_key(i, TASK_ASSIGNMENT, 0) ^ feature_key(i, TASK_ASSIGNMENT, processor_index + 1))
+
+        self.action_keys = np.concatenate((self.action_keys, np.array(action_keys, dtype=np.uint64)))
+        self.assignment_keys = np.concatenate((self.assignment_keys, np.array(assignment_keys, dtype=np.uint64)))
+        if len(self.action_n) < len(self.action_keys):
+            self.action_n = np.concatenate(
+                (self.action_n, np.zeros(len(self.action_keys) - len(self.action_n), dtype=np.int64)))
+
+    def load_snapshot(self):
+        '''
+        Warm-starts the Q-table, the visit counts, epsilon and lambda from the snapshot of an earlier run. The visit
+        counts are kept only if the number of actions per task has not changed.
+        '''
+        with np.load(self.snapshot_path) as snapshot:
+            self.q_table.load(snapshot['q_keys'], snapshot['q_values'], snapshot['q_visits'])
+            if int(snapshot['task_actions']) == len(self.processors):
+                self.action_n = snapshot['action_n'].copy()
+            self.epsilon = float(snapshot['epsilon'])
+            self.lam = float(snapshot['lam'])
+
+        print("Loaded RL snapshot: ", self.snapshot_path)
+
+    def save_snapshot(self):
+        if self.snapshot_path is None:
+            return
+
+        # write the whole file before replacing the previous snapshot
+        temp_fd, temp_path = tempfile.mkstemp(suffix='.tmp', dir=os.path.dirname(self.snapshot_path) or '.')
+        try:
+            with os.fdopen(temp_fd, 'wb') as file:
+                np.savez(file, q_keys=self.q_table.keys, q_values=self.q_table.values, q_visits=self.q_table.visits,
+                         task_actions=len(self.processors), action_n=self.action_n, epsilon=self.epsilon,
+                         lam=self.lam)
+            os.replace(temp_path, self.snapshot_path)
+        except BaseException:
+            os.remove(temp_path)
+            raise
+
+    def shutdown(self):
+        '''
+        Stops the rollout worker processes, a later parallel round starts new ones.
+        '''
+        for pool in self.rollout_pools:
+            pool.shutdown(wait=False)
+        self.rollout_pools = []
+        self.rollout_updates = []
+
+    def random_action(self, actions: np.ndarray):
         return random.choice(actions)
 
-    def ucb_action(self, state: Tuple, actions: list, current_time: int):
-        max_ucb = - math.inf
-        best_action = None
-
-        for action in actions:
-            if self.action_n[action] == 0:
-                best_action = action
-                break
-
-            ucb = self.q_table[(state, action)] + self.lam * (
-                math.sqrt(math.log(current_time) / self.action_n[action]))
-            if ucb > max_ucb:
-                max_ucb = ucb
-                best_action = action
+    def ucb_action(self, state_key: np.uint64, actions: np.ndarray, current_time: int):
+        action_n = self.action_n[actions]
+        unvisited = np.flatnonzero(action_n == 0)
+        if len(unvisited) > 0:
+            return actions[unvisited[0]]
 
-        return best_action
+        ucb = self.q_table.get_many(state_key ^ self.action_keys[actions]) + self.lam * (
+            np.sqrt(math.log(max(current_time, 1)) / action_n))
+        return actions[np.argmax(ucb)]
 
     def update_lambda(self):
-        reward_mean = sum(self.last_rewards) / len(self.last_rewards)
-        reward_variance = 0.0
-        for reward in self.last_rewards:
-            reward_variance += (reward - reward_mean) ** 2
-
-        self.lam = 1 / (1 + (reward_variance / len(self.last_rewards)))
-
-    def reset_environment(self):
-        for processor in self.processors:
-            processor.clear_cache()
-
+        self.lam = 1 / (1 + (self.last_rewards_stats.m2 / len(self.last_rewards)))
+
+    def start_environment(self):
+        '''
+        Sums up the rewards of the ready tasks placed in earlier rounds, which every episode of the round starts from.
+        '''
+        self.episode_qos = 0.0
+        self.episode_reward_deadline = 0.0
+        self.episode_max_d = 0.0
+        self.episode_min_d = math.inf
+        self.episode_max_d_reward = -math.inf
+        self.episode_min_d_reward = math.inf
+
+        self.ready_task_count = len(self.ready_tasks)
         for task_index in self.ready_tasks:
-            task = self.tasks[task_index]
-            task.clear_cache()
-
-    def calculate_reward(self):
-        reward_deadline = 0.0
+            self.add_episode_task(self.tasks[task_index])
 
-        qos = 0.0
-        max_d = 0.0
-        min_d = math.inf
-        max_d_reward = -math.inf
-        min_d_reward = math.inf
+        self.round_rewards = (self.episode_qos, self.episode_reward_deadline, self.episode_max_d, self.episode_min_d,
+                              self.episode_max_d_reward, self.episode_min_d_reward)
 
-        for task_index in self.ready_tasks:
-            task = self.tasks[task_index]
-            if len(task.temp_execution_times) > 0:
-                qos += self.qos(task)
-
-                if task.temp_execution_times[-1][2] <= task.absolute_deadline:
-                    c = task.temp_execution_times[-1][2] - task.arrival_time
-                    d = task.absolute_deadline - task.arrival_time
-                    reward_deadline_task = float(1 - ((c / d) ** self.reward_deadline_sensitivity))
-                    if task.task_type == TaskType.FIRM:
-                        reward_deadline_task *= 2
-                    reward_deadline += reward_deadline_task
-                    if reward_deadline_task > max_d_reward:
-                        max_d_reward = reward_deadline_task
-                    if reward_deadline_task < min_d_reward:
-                        min_d_reward = reward_deadline_task
-                    if d > max_d:
-                        max_d = d
-                    if d < min_d:
-                        min_d = d
-
-        qos = qos / len(self.ready_tasks)
+    def reset_environment(self):
+        '''
+        Rolls back the actions of the previous episode, newest first.
+        '''
+        while len(self.undo_log) > 0:
+            task, processor, remaining_execution_cost = self.undo_log.pop()
+            processor.allocations.pop()
+            task.execution_times.pop()
+            task.remaining_execution_cost = remaining_execution_cost
+
+        (self.episode_qos, self.episode_reward_deadline, self.episode_max_d, self.episode_min_d,
+         self.episode_max_d_reward, self.episode_min_d_reward) = self.round_rewards
+
+    def add_episode_task(self, task: SubTask):
+        '''
+        Adds the QoS and deadline reward of a placed task to the episode aggregates. The deadline reward uses the
+        deadline sensitivity of the moment the task is placed.
+        '''
+        if len(task.execution_times) == 0:
+            return
+
+        self.episode_qos += self.qos(task)
+
+        if task.execution_times[-1][2] <= task.absolute_deadline:
+            c = task.execution_times[-1][2] - task.arrival_time
+            d = task.absolute_deadline - task.arrival_time
+            reward_deadline_task = float(1 - ((c / d) ** self.reward_deadline_sensitivity))
+            if task.task_type == TaskType.FIRM:
+                reward_deadline_task *= 2
+            self.episode_reward_deadline += reward_deadline_task
+            if reward_deadline_task > self.episode_max_d_reward:
+                self.episode_max_d_reward = reward_deadline_task
+            if reward_deadline_task < self.episode_min_d_reward:
+                self.episode_min_d_reward = reward_deadline_task
+            if d > self.episode_max_d:
+                self.episode_max_d = d
+            if d < self.episode_min_d:
+                self.episode_min_d = d
+
+    def calculate_reward(self, task: SubTask):
+        '''
+        Returns the reward of the action that has just placed or offloaded the task.
+        '''
+        self.add_episode_task(task)
+
+        qos = self.episode_qos / self.ready_task_count
         if len(self.reward_qos_values) > 100:
+            for reward in self.reward_qos_values[:50]:
+                self.reward_qos_stats.remove(reward)
             del self.reward_qos_values[:50]
         self.reward_qos_values.append(qos)
+        self.reward_qos_stats.add(qos)
 
-        reward_qos_mean = sum(self.reward_qos_values) / len(self.reward_qos_values)
-        reward_qos_mean_variance = 0.0
-        for reward in self.reward_qos_values:
-            reward_qos_mean_variance += (reward - reward_qos_mean) ** 2
-
-        reward_qos_mu = math.sqrt(reward_qos_mean_variance)
+        reward_qos_mean = self.reward_qos_stats.mean
+        reward_qos_mu = self.reward_qos_stats.deviation()
         if reward_qos_mu != 0:
             self.reward_qos_sensitivity = reward_qos_mean / reward_qos_mu
             reward_qos = ((qos - reward_qos_mean) / reward_qos_mu) * (
@@ -296,23 +608,25 @@ class Scheduler:
         else:
             reward_qos = 0
 
-        if max_d_reward != 0 and max_d > 2 * min_d:
-            self.reward_deadline_sensitivity = math.log(max_d_reward / min_d_reward) / (
+        max_d = self.episode_max_d
+        min_d = self.episode_min_d
+        if self.episode_min_d_reward > 0 and max_d > 2 * min_d:
+            self.reward_deadline_sensitivity = math.log(self.episode_max_d_reward / self.episode_min_d_reward) / (
                 math.log((max_d - min_d) / min_d)
             )
 
-        return 0.5 * reward_qos + 0.5 * reward_deadline
+        return 0.5 * reward_qos + 0.5 * self.episode_reward_deadline
 
     def qos(self, task: SubTask) -> float:
         ex_before_deadline = 0
-        ex_after_deadline = task.temp_remaining_execution_cost
+        ex_after_deadline = task.remaining_execution_cost
 
         if task.task_type == TaskType.FIRM:
-            if len(task.temp_execution_times) == 0 or task.temp_execution_times[-1][2] > task.absolute_deadline:
+            if len(task.execution_times) == 0 or task.execution_times[-1][2] > task.absolute_deadline:
                 return 0
             return 1
 
-        for ex in task.temp_execution_times:
+        for ex in task.execution_times:
             if ex[2] <= task.absolute_deadline:
                 ex_before_deadline += self.processors[ex[0]].get_execution_cost(ex[2] - ex[1])
             elif ex[1] < task.absolute_deadline < ex[2]:
@@ -352,3 +666,66 @@ class Scheduler:
                         del task.execution_times[e]
                     else:
                         e += 1
+
+
+def device_snapshot_path(address: str) -> str | None:
+    '''
+    RL_SNAPSHOT_PATH with the device address added before the extension, so the devices sharing the setting keep
+    their own snapshots. None when no snapshot path is set.
+    '''
+    path = os.environ.get('RL_SNAPSHOT_PATH')
+    if path is None or address == '':
+        return path
+    root, extension = os.path.splitext(path)
+    return f"{root}-{address.replace(':', '-')}{extension}"
+
+
+def rollout_context():
+    '''
+    Start method of the rollout workers: forked from a server process that imported this module once, so a worker
+    starts without importing everything again, or spawned where there is no fork server.
+    '''
+    if 'forkserver' not in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context('spawn')
+    context = multiprocessing.get_context('forkserver')
+    context.set_forkserver_preload(['__main__', __name__])
+    return context
+
+
+# Q-table of a rollout worker process, kept between rounds
+ROLLOUT_Q_TABLE: QTable | None = None
+
+
+def start_rollout_worker(q_table: QTable):
+    global ROLLOUT_Q_TABLE
+    ROLLOUT_Q_TABLE = q_table
+
+
+def run_rollout(scheduler: Scheduler, q_updates: list[tuple[int, float]], episodes: int, current_time: int,
+                ready_tasks_type: list[TaskType], state_quantize: int, budget: float | None, seed: int) -> tuple:
+    '''
+    Runs episodes on a scheduler snapshot in a worker process, against the worker's Q-table once the merged values
+    of the last round are set. With a budget (seconds) it stops starting episodes once the budget has passed.
+    Returns the Q-value changes, the visit count changes, the number of episodes run, the actions and total reward
+    of the kept episode and the reward statistics to carry on with.
+    '''
+    random.seed(seed)
+    deadline = None
+    if budget is not None:
+        deadline = time.perf_counter() + budget
+
+    for key, value in q_updates:
+        ROLLOUT_Q_TABLE.set(key, value)
+    scheduler.q_table = ROLLOUT_Q_TABLE
+    action_n = scheduler.action_n.copy()
+    scheduler.q_table.changes = {}
+
+    episode_actions, episodes, episode_reward = scheduler.run_episodes(
+        episodes, current_time, list(scheduler.ready_tasks), ready_tasks_type, state_quantize, deadline)
+
+    q_changes = [(key, scheduler.q_table.get(key) - value) for key, value in scheduler.q_table.changes.items()]
+    scheduler.q_table.changes = None
+    return (q_changes, scheduler.action_n - action_n, episodes, episode_actions, episode_reward, scheduler.lam,
+            scheduler.last_rewards, scheduler.last_rewards_index, scheduler.last_rewards_stats,
+            scheduler.reward_qos_values, scheduler.reward_qos_stats, scheduler.reward_qos_sensitivity,
+            scheduler.reward_deadline_sensitivity)
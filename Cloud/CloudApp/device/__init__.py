@@ -13,6 +13,7 @@ from ..dtos.EdgeSerializer import EdgeSerializer
 from ..dtos.SubTaskSerializer import SubTaskSerializer
 from ..types.Edge import Edge
 from ..types.Fog import Fog
+from ..types.NotificationBatcher import NotificationBatcher
 from ..types.PreemptionType import PreemptionType
 from ..types.Processor import Processor
 from ..types.SubTask import SubTask
@@ -33,6 +34,7 @@ class _Device:
         self.preemption_type = PreemptionType[os.environ.get('PREEMPTION_TYPE', 'Lazy')]
         self.fogs: list[Fog] = []
         self.edges: list[Edge] = []
+        self.notification_batcher = NotificationBatcher()
         self.algorithm: str = "MEES"
         self.output_name: str = ""
 
@@ -83,12 +85,15 @@ class _Device:
         for i in range(len(self.edges)):
             if self.edges[i].address == edge['address']:
                 return
-        self.edges.append(Edge(edge))
+        self.edges.append(Edge(edge, self.notification_batcher))
 
     def get_nodes(self):
         return self.fogs, self.edges
 
     def add_task(self, edge_address: str, new_task: SubTaskSerializer):
+        self.add_tasks(edge_address, [new_task])
+
+    def add_tasks(self, edge_address: str, new_tasks: list[SubTaskSerializer]):
         edge: Edge | None = None
         for i in range(len(self.edges)):
             if self.edges[i].address == edge_address:
@@ -97,10 +102,12 @@ class _Device:
         if edge is None:
             raise Exception('Edge is not registered.')
 
-        task = SubTask(edge, new_task['id'], new_task['workflowId'], new_task['jobId'], new_task['type'],
-                       new_task['executionCost'],
-                       new_task['memory'], new_task['absoluteDeadline'])
-        self.scheduler.add_task(task)
+        tasks: list[SubTask] = []
+        for new_task in new_tasks:
+            tasks.append(SubTask(edge, new_task['id'], new_task['workflowId'], new_task['jobId'], new_task['type'],
+                                 new_task['executionCost'],
+                                 new_task['memory'], new_task['absoluteDeadline']))
+        self.scheduler.add_tasks(tasks)
 
     def run(self):
         # scheduling
@@ -111,11 +118,13 @@ class _Device:
         max_scheduling_round_time = 0.0
 
         while DEVICE.status == DeviceStatus.RUNNING:
+            # cleared before scheduling so arrivals during the round are not missed
+            self.scheduler.wakeup.clear()
 
             f = time.time()
 
-            current_time = int((time.time() - self.start_time) * 1000 * self.time_scale)
-            self.scheduler.schedule(current_time, self.total_time)
+            current_time = int((f - self.start_time) * 1000 * self.time_scale)
+            next_event_time = self.scheduler.schedule(current_time, self.total_time)
 
             e = time.time()
             if e - f > max_scheduling_round_time:
@@ -124,6 +133,11 @@ class _Device:
             if current_time > self.total_time:
                 DEVICE.status = DeviceStatus.STOPPED
                 self.result()
+                break
+
+            # sleep until a processor frees up, a placed task completes, a new arrival or the end of the run
+            next_event_time = min(next_event_time, self.total_time + 1)
+            self.scheduler.wakeup.wait(max(next_event_time - current_time, 0) / (1000 * self.time_scale))
 
         print("Max Scheduling Round Time: ", max_scheduling_round_time * 1000)
 
@@ -186,5 +200,12 @@ class _Device:
             energy = p.active_power * total_active + p.idle_power * (self.total_time - total_active)
             print(f"Energy {p.index}: {energy}")
 
+        if isinstance(self.scheduler, Scheduler):
+            print(f"Episodes per Round: min {self.scheduler.round_episodes_min} "
+                  f"| mean {self.scheduler.round_episodes_stats.mean:.2f} "
+                  f"| max {self.scheduler.round_episodes_max}")
+            self.scheduler.save_snapshot()
+            self.scheduler.shutdown()
+
 
 DEVICE = _Device()
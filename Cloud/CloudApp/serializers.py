@@ -42,3 +42,8 @@ class CloudSerializer:
         class PushTaskRequest(serializers.Serializer):
             edgeAddress = serializers.CharField()
             task = SubTaskSerializer()
+
+    class PushTasks:
+        class PushTasksRequest(serializers.Serializer):
+            edgeAddress = serializers.CharField()
+            tasks = serializers.ListField(child=SubTaskSerializer())
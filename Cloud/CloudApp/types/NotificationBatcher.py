@@ -0,0 +1,95 @@
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+
+class NotificationBatcher:
+    '''
+    Groups the completion notifications per edge and sends each group in one notifyExecuteTasks request, once the
+    batch window passes or the group reaches the batch size, over keep-alive sessions, one per edge in every worker
+    since a session is not thread-safe.
+    '''
+
+    def __init__(self):
+        self.workers: int = int(os.environ.get('NOTIFY_WORKERS', 4))
+        self.batch_window: float = float(os.environ.get('NOTIFY_BATCH_WINDOW', 5))  # ms
+        self.batch_size: int = int(os.environ.get('NOTIFY_BATCH_SIZE', 50))
+        self.executor = ThreadPoolExecutor(max_workers=self.workers)
+        self.headers = {
+            'Content-Type': 'application/json'
+        }
+
+        # per worker thread: edge address -> keep-alive session
+        self.local = threading.local()
+        # edge address -> [0: task id, 1: workflow id, 2: job id]
+        self.batches: dict[str, list[tuple[int, int, int]]] = {}
+        # edge address -> time at which its batch is sent
+        self.flush_times: dict[str, float] = {}
+        self.batches_condition = threading.Condition()
+
+        _flush_thread = threading.Thread(target=self.flush, args=(), daemon=True)
+        _flush_thread.start()
+
+    def notify(self, address: str, task_id: int, workflow_id: int, job_id: int):
+        with self.batches_condition:
+            if address not in self.batches:
+                self.batches[address] = []
+                self.flush_times[address] = time.time() + self.batch_window / 1000
+            self.batches[address].append((task_id, workflow_id, job_id))
+            if len(self.batches[address]) >= self.batch_size:
+                # full batch, send it right away
+                self.flush_times[address] = 0
+            self.batches_condition.notify()
+
+    def flush(self):
+        while True:
+            with self.batches_condition:
+                while len(self.flush_times) == 0:
+                    self.batches_condition.wait()
+
+                address = min(self.flush_times, key=self.flush_times.get)
+                remaining_time = self.flush_times[address] - time.time()
+                if remaining_time > 0:
+                    self.batches_condition.wait(remaining_time)
+                    continue
+
+                del self.flush_times[address]
+                batch = self.batches.pop(address)
+
+            self.executor.submit(self.send, address, batch)
+
+    def get_session(self, address: str) -> requests.Session:
+        sessions: dict[str, requests.Session] | None = getattr(self.local, 'sessions', None)
+        if sessions is None:
+            sessions = {}
+            self.local.sessions = sessions
+        if address not in sessions:
+            sessions[address] = requests.Session()
+        return sessions[address]
+
+    def send(self, address: str, batch: list[tuple[int, int, int]]):
+        data = {
+            "tasks": [
+                {
+                    "taskId": task_id,
+                    "workflowId": workflow_id,
+                    "jobId": job_id
+                }
+                for task_id, workflow_id, job_id in batch
+            ]
+        }
+
+        url = f"http://{address}/EdgeApp/Edge/tasks/notifyExecuteTasks/"
+        try:
+            response = self.get_session(address).patch(url, data=json.dumps(data), headers=self.headers)
+
+            if response.status_code == 200:
+                print(f"Data successfully back to the Edge {address}")
+            else:
+                print(f"Failed to submit data: {response.status_code}")
+        except Exception as e:
+            print(f"Failed to submit data: {e}")
@@ -12,7 +12,6 @@ class Processor:
 
         # [0: task index, 1: start time, 2: end time]
         self.allocations: list[list[int]] = []
-        self.temp_allocations: list[list[int]] = []
 
     def get_execution_time(self, execution_cost: int) -> int:
         '''
@@ -25,9 +24,3 @@ class Processor:
 
     def clear(self):
         self.allocations.clear()
-
-    def clear_cache(self):
-        self.temp_allocations = [item for item in self.allocations]
-
-    def apply_cache(self):
-        self.allocations = [item for item in self.temp_allocations]
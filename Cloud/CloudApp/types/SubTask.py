@@ -28,15 +28,5 @@ class SubTask:
 
         # 0: processor index, 1: start time, 2: end time
         self.execution_times: list[list[int]] = []
-        self.temp_execution_times: list[list[int]] = []
-        self.temp_remaining_execution_cost = execution_cost
 
         self.is_notify = False
-
-    def clear_cache(self):
-        self.temp_execution_times = [item for item in self.execution_times]
-        self.temp_remaining_execution_cost = self.remaining_execution_cost
-
-    def apply_cache(self):
-        self.execution_times = [item for item in self.temp_execution_times]
-        self.remaining_execution_cost = self.temp_remaining_execution_cost
@@ -1,14 +1,15 @@
 import math
 import random
 import time
-from queue import Queue
-from threading import Lock
+from collections import deque
+from threading import Lock, Event
 from typing import Tuple
 
 from .HEFT import HEFT
 from ..types.Cloud import Cloud
 from ..types.DAG import DAG
 from ..types.Fog import Fog
+from ..types.FogIndex import FogIndex
 from ..types.PeriodicTask import PeriodicTask
 from ..types.PreemptionType import PreemptionType
 from ..types.Processor import Processor
@@ -22,13 +23,20 @@ class FuzzyScheduler:
         self.bus_bandwidth = bus_bandwidth
         self.start_time: float | None = None
         self.time_scale = time_scale
+        # wall clock in seconds, replaced by a virtual clock in simulation
+        self.clock = time.time
         self.dags: list[DAG] = []
         self.periodic_tasks: list[PeriodicTask] = []
-        self.scheduling_queue = Queue()
-        self.backup_queue = Queue()
+        # (workflow id, task id, job id) -> (task index, workflow index), the job id of DAG subtasks is -1
+        self.task_locations: dict[Tuple[int, int, int], Tuple[int, int]] = {}
+        self.scheduling_queue = deque()
+        self.backup_queue = deque()
         self.queue_lock = Lock()
+        # set on every arrival or completion so an idle scheduling thread wakes up
+        self.wakeup = Event()
         self.preemption_type: PreemptionType = preemption_type
         self.fogs: list[Fog] = []
+        self.fog_index = FogIndex(self.fogs)
         self.cloud: Cloud = cloud
         self.position: Tuple[int, int] | None = None
         self.back_address = back_address
@@ -37,9 +45,10 @@ class FuzzyScheduler:
         self.queue_lock.acquire()
         self.periodic_tasks.clear()
         self.dags.clear()
+        self.task_locations.clear()
         for processor in self.processors:
             processor.clear()
-        self.scheduling_queue.queue.clear()
+        self.scheduling_queue.clear()
         self.queue_lock.release()
 
     def add_dags(self, new_dags: list[DAG]):
@@ -52,79 +61,94 @@ class FuzzyScheduler:
             self.dags.append(new_dags[i])
             for j in range(len(new_dags[i].subtasks)):
                 new_dags[i].subtasks[j].index = j
+                self.task_locations.setdefault((new_dags[i].id, new_dags[i].subtasks[j].id, -1), (j, dags_count + i))
                 new_dags[i].subtasks[j].arrival_time = new_dags[i].arrival_time
                 new_dags[i].subtasks[j].absolute_deadline = (float(new_dags[i].subtasks[j].deadline)
                                                              + new_dags[i].arrival_time) / 1000 + self.start_time
-                self.scheduling_queue.put((new_dags[i].arrival_time, j, i + dags_count, -1))
+                self.scheduling_queue.append((new_dags[i].arrival_time, j, i + dags_count, -1))
         self.queue_lock.release()
+        self.wakeup.set()
 
     def add_periodic_tasks(self, new_periodic_tasks: list[PeriodicTask]):
         self.queue_lock.acquire()
-        arrival_time = int((time.time() - self.start_time) * 1000 * self.time_scale)
+        arrival_time = int((self.clock() - self.start_time) * 1000 * self.time_scale)
         periodic_tasks_count = len(self.periodic_tasks)
         self.periodic_tasks.extend(new_periodic_tasks)
         for i in range(len(new_periodic_tasks)):
             index = i + periodic_tasks_count
             new_periodic_tasks[i].index = index
+            self.task_locations.setdefault((-1, new_periodic_tasks[i].id, new_periodic_tasks[i].job_id), (index, -1))
             new_periodic_tasks[i].arrival_time = arrival_time
             new_periodic_tasks[i].absolute_deadline = ((float(new_periodic_tasks[i].deadline)
                                                         + new_periodic_tasks[i].arrival_time) / 1000
                                                        + self.start_time)
 
-            self.scheduling_queue.put((arrival_time, index, -1, 0))
+            self.scheduling_queue.append((arrival_time, index, -1, 0))
         self.queue_lock.release()
+        self.wakeup.set()
 
     def update_position(self, position: Tuple[int, int]):
         self.position = position
 
     def notify_execute_task(self, current_time: int, task_id: int, workflow_id: int, job_id: int):
-        if workflow_id == -1:
-            for task in self.periodic_tasks:
-                if task.id == task_id and task.job_id == job_id:
-                    task.remaining_execution_cost = 0
-                    task.execution_times = [[-1, current_time, current_time]]
-                    task.latency = (time.time() - task.offload_time) * 1000
-                    break
-        else:
-            for dag in self.dags:
-                if dag.id == workflow_id:
-                    for task in dag.subtasks:
-                        if task.id == task_id:
-                            task.remaining_execution_cost = 0
-                            task.execution_times = [[-1, current_time, current_time]]
-                            task.latency = (time.time() - task.offload_time) * 1000
-                            break
-                    break
-
-    def schedule(self, current_time: int, total_time: int):
+        self.notify_execute_tasks(current_time, [(task_id, workflow_id, job_id)])
+
+    def notify_execute_tasks(self, current_time: int, tasks: list[Tuple[int, int, int]]):
+        for task_id, workflow_id, job_id in tasks:
+            location = self.task_locations.get((workflow_id, task_id, job_id if workflow_id == -1 else -1))
+            if location is None:
+                continue
+            task: SubTask = self.periodic_tasks[location[0]] if location[1] == -1 \
+                else self.dags[location[1]].subtasks[location[0]]
+            task.remaining_execution_cost = 0
+            task.execution_times = [[-1, current_time, current_time]]
+            task.latency = (self.clock() - task.offload_time) * 1000
+        self.wakeup.set()
+
+    def schedule(self, current_time: int, total_time: int) -> float:
+        next_event_time = math.inf
+
         self.queue_lock.acquire()
-        q_size = self.scheduling_queue.qsize()
+        q_size = len(self.scheduling_queue)
         for i in range(q_size):
-            release_time, task_index, workflow_index, job_index = self.scheduling_queue.get()
+            release_time, task_index, workflow_index, job_index = self.scheduling_queue.popleft()
             if current_time < release_time:
-                self.backup_queue.put((release_time, task_index, workflow_index, job_index))
-            elif current_time < self.data_availability(current_time, task_index, workflow_index):
-                self.backup_queue.put((release_time, task_index, workflow_index, job_index))
+                self.backup_queue.append((release_time, task_index, workflow_index, job_index))
+                next_event_time = min(next_event_time, release_time)
+                continue
+
+            data_available = self.data_availability(current_time, task_index, workflow_index)
+            if current_time < data_available:
+                self.backup_queue.append((release_time, task_index, workflow_index, job_index))
+                next_event_time = min(next_event_time, data_available)
             else:
+                deferred = len(self.backup_queue)
                 self.schedule_subtask(current_time, total_time, task_index, workflow_index, job_index)
-        while not self.backup_queue.empty():
-            self.scheduling_queue.put(self.backup_queue.get())
+                if len(self.backup_queue) == deferred:
+                    next_event_time = current_time
+                else:
+                    # all processors are busy, retry once the first one becomes idle
+                    for p in self.processors:
+                        if len(p.allocations) > 0 and p.allocations[-1][4] > current_time:
+                            next_event_time = min(next_event_time, p.allocations[-1][4])
+        self.scheduling_queue.extend(self.backup_queue)
+        self.backup_queue.clear()
 
         self.queue_lock.release()
 
-    def data_availability(self, current_time: int, task_index: int, workflow_index: int) -> int:
+        return next_event_time
+
+    def data_availability(self, current_time: int, task_index: int, workflow_index: int) -> float:
         if workflow_index == -1:
             return 0
 
         data_available = 0
-        predecessors = [(edge[0], edge[2]) for edge
-                        in self.dags[workflow_index].edges
-                        if edge[1] == task_index]
-
-        for predecessor in predecessors:
-            task = self.dags[workflow_index].subtasks[predecessor[0]]
+        dag = self.dags[workflow_index]
+        for k in range(dag.predecessor_offsets[task_index], dag.predecessor_offsets[task_index + 1]):
+            task = dag.subtasks[dag.predecessor_indices[k]]
             if task.remaining_execution_cost != 0:
-                return current_time + 1
+                # ready once the predecessor is scheduled or its offload is notified
+                return math.inf
 
             if task.execution_cost == 0:
                 # dummy task
@@ -153,7 +177,7 @@ class FuzzyScheduler:
             self.offload(task)
         else:
             if candidate_processor is None:
-                self.backup_queue.put((task.arrival_time, task_index, workflow_index, job_index))
+                self.backup_queue.append((task.arrival_time, task_index, workflow_index, job_index))
                 return
 
             new_idle = self.check_processor(candidate_processor, start_time, task_index, workflow_index, job_index,
@@ -176,7 +200,8 @@ class FuzzyScheduler:
             if job.deadline + job.arrival_time >= total_time:
                 return
             self.periodic_tasks.append(job)
-            self.scheduling_queue.put((job.arrival_time, job.index, -1, job.job_index))
+            self.task_locations.setdefault((-1, job.id, job.job_id), (job.index, -1))
+            self.scheduling_queue.append((job.arrival_time, job.index, -1, job.job_index))
 
     def check_processor(self, p: Processor, start_time: int, task_index: int, workflow_index: int, job_index: int,
                         only_check: bool) -> bool:
@@ -200,25 +225,22 @@ class FuzzyScheduler:
         return True
 
     def offload(self, task: SubTask):
-        available_fogs_index = []
-        for i in range(len(self.fogs)):
-            fog = self.fogs[i]
-            if fog.is_in_range(self.position[0], self.position[1]):
-                available_fogs_index.append(i)
+        available_fogs_index = self.fog_index.in_range(self.position[0], self.position[1])
 
         if len(available_fogs_index) != 0:
             # select randomly one fog or cloud
             selected_fog_index = random.choice(available_fogs_index)
             self.fogs[selected_fog_index].offload(self.back_address, task)
-            task.offload_time = time.time()
+            task.offload_time = self.clock()
 
         if len(available_fogs_index) == 0 and self.cloud is not None:
             # offload on cloud
             self.cloud.offload(self.back_address, task)
-            task.offload_time = time.time()
+            task.offload_time = self.clock()
 
     def update_network(self):
         self.fogs = self.cloud.get_nodes()
+        self.fog_index = FogIndex(self.fogs)
 
     def fuzzy_offload_decision(self, task: SubTask, processor: Processor | None, current_time):
         """
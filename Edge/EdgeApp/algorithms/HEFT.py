@@ -1,5 +1,4 @@
 import math
-from typing import Tuple
 
 import numpy as np
 
@@ -26,7 +25,7 @@ class HEFT:
             self.execution_times.append([p.get_execution_time(subtask.execution_cost) for p in self.processors])
 
     def schedule(self):
-        self.calculate_ranku(0)
+        self.calculate_ranku()
         scheduling_queue = ReversePriorityQueue.get()
         for i in range(len(self.subtask_info)):
             scheduling_queue.put((ReversePriority(self.subtask_info[i][0]), i))
@@ -39,30 +38,44 @@ class HEFT:
             self.subtask_info[i][2] = finish_time
             self.subtask_info[i][3] = processor
 
-    def calculate_ranku(self, index: int):
-        computation_avg = math.ceil(np.mean(self.execution_times[index]))
-
-        successors: list[Tuple[int, int]] = [(edge[1], edge[2]) for edge in self.dag.edges if edge[0] == index]
-        if len(successors) == 0:
-            self.subtask_info[index][0] = computation_avg
-        else:
-            successor_ranku_max = max(self.calculate_ranku(successors[i][0]) + successors[i][1]
-                                      for i in range(len(successors)))
-            self.subtask_info[index][0] = computation_avg + successor_ranku_max
-
-        return self.subtask_info[index][0]
+    def calculate_ranku(self):
+        '''
+        Computes the upward rank of every subtask in one pass, visiting each subtask after all its successors.
+        '''
+        computation_avg = np.ceil(np.mean(np.array(self.execution_times), axis=1)).astype(int).tolist()
+
+        # number of successors whose rank is not computed yet
+        waiting_successors = [self.dag.successor_offsets[i + 1] - self.dag.successor_offsets[i]
+                              for i in range(len(self.dag.subtasks))]
+        ready = [i for i in range(len(self.dag.subtasks)) if waiting_successors[i] == 0]
+        while len(ready) > 0:
+            index = ready.pop()
+
+            successor_ranku_max = 0
+            for k in range(self.dag.successor_offsets[index], self.dag.successor_offsets[index + 1]):
+                successor_ranku = self.subtask_info[self.dag.successor_indices[k]][0] + self.dag.successor_data_sizes[k]
+                if successor_ranku > successor_ranku_max:
+                    successor_ranku_max = successor_ranku
+            self.subtask_info[index][0] = computation_avg[index] + successor_ranku_max
+
+            for k in range(self.dag.predecessor_offsets[index], self.dag.predecessor_offsets[index + 1]):
+                predecessor = self.dag.predecessor_indices[k]
+                waiting_successors[predecessor] -= 1
+                if waiting_successors[predecessor] == 0:
+                    ready.append(predecessor)
 
     def eft(self, index: int) -> (int, int, int):
         start_time = np.inf
         finish_time = np.inf
         processor_index = -1
+        begin, end = self.dag.predecessor_offsets[index], self.dag.predecessor_offsets[index + 1]
         for p in range(len(self.processors)):
-            predecessors: list[Tuple[int, int]] = [(edge[0], edge[2]) for edge in self.dag.edges if edge[1] == index]
             data_available_time = 0
-            for predecessor in predecessors:
-                data_available_time_candidate = self.subtask_info[predecessor[0]][2]
-                if p != self.subtask_info[predecessor[0]][3]:
-                    data_available_time_candidate += math.ceil(predecessor[1] / self.bus_bandwidth)
+            for k in range(begin, end):
+                predecessor = self.dag.predecessor_indices[k]
+                data_available_time_candidate = self.subtask_info[predecessor][2]
+                if p != self.subtask_info[predecessor][3]:
+                    data_available_time_candidate += math.ceil(self.dag.predecessor_data_sizes[k] / self.bus_bandwidth)
                 if data_available_time_candidate > data_available_time:
                     data_available_time = data_available_time_candidate
 
@@ -1,6 +1,7 @@
+import heapq
 import math
 import time
-from threading import Lock
+from threading import Lock, Event
 from typing import Tuple
 
 from .HEFT import HEFT
@@ -8,7 +9,10 @@ from .SchedulerPriorityQueue import SchedulerPriorityQueue, SchedulerPriority
 from ..types.Cloud import Cloud
 from ..types.DAG import DAG
 from ..types.Fog import Fog
+from ..types.FogIndex import FogIndex
+from ..types.MobilityPredictor import MobilityPredictor
 from ..types.PeriodicTask import PeriodicTask
+from ..types.PlacementOperation import PlacementOperation
 from ..types.PreemptionType import PreemptionType
 from ..types.Processor import Processor
 from ..types.SubTask import SubTask, TaskType
@@ -21,13 +25,31 @@ class Scheduler:
         self.bus_bandwidth = bus_bandwidth
         self.start_time: float | None = None
         self.time_scale = time_scale
+        # wall clock in seconds, replaced by a virtual clock in simulation
+        self.clock = time.time
         self.dags: list[DAG] = []
         self.periodic_tasks: list[PeriodicTask] = []
+        # (workflow id, task id, job id) -> (task index, workflow index), the job id of DAG subtasks is -1
+        self.task_locations: dict[Tuple[int, int, int], Tuple[int, int]] = {}
+        # ready tasks, ordered by priority
         self.scheduling_queue = SchedulerPriorityQueue.get()
-        self.backup_queue = SchedulerPriorityQueue.get()
+        # [0: ready time, 1: workflow index, 2: task index, 3: job index] tasks whose predecessors are finished
+        # but whose release time or input data is still in the future
+        self.release_calendar: list[Tuple[int, int, int, int]] = []
+        # (task index, workflow index) of the tasks in the release calendar or in the scheduling queue
+        self.queued_tasks: set[Tuple[int, int]] = set()
+        # per workflow: number of unfinished predecessors of each subtask
+        self.waiting_predecessors: list[list[int]] = []
+        # tasks preempted in the current round, released again at the end of the round
+        self.preempted_tasks: list[Tuple[int, int, int]] = []
         self.queue_lock = Lock()
+        # set on every arrival or completion so an idle scheduling thread wakes up
+        self.wakeup = Event()
         self.preemption_type: PreemptionType = preemption_type
         self.fogs: list[Fog] = []
+        self.fog_index = FogIndex(self.fogs)
+        # set by the device once its position history exists
+        self.mobility_predictor: MobilityPredictor | None = None
         self.cloud: Cloud = cloud
         self.position: Tuple[int, int] | None = None
         self.back_address = back_address
@@ -36,9 +58,14 @@ class Scheduler:
         self.queue_lock.acquire()
         self.periodic_tasks.clear()
         self.dags.clear()
+        self.task_locations.clear()
         for processor in self.processors:
             processor.clear()
         self.scheduling_queue.queue.clear()
+        self.release_calendar.clear()
+        self.queued_tasks.clear()
+        self.waiting_predecessors.clear()
+        self.preempted_tasks.clear()
         self.queue_lock.release()
 
     def add_dags(self, new_dags: list[DAG]):
@@ -49,90 +76,174 @@ class Scheduler:
             heft.schedule()
             heft.assign_subtask_deadlines()
             self.dags.append(new_dags[i])
+
+            waiting_predecessors: list[int] = [0 for _ in new_dags[i].subtasks]
+            for j in range(len(new_dags[i].subtasks)):
+                for k in range(new_dags[i].predecessor_offsets[j], new_dags[i].predecessor_offsets[j + 1]):
+                    if new_dags[i].subtasks[new_dags[i].predecessor_indices[k]].remaining_execution_cost != 0:
+                        # dummy predecessors never block their successors
+                        waiting_predecessors[j] += 1
+            self.waiting_predecessors.append(waiting_predecessors)
+
             for j in range(len(new_dags[i].subtasks)):
                 new_dags[i].subtasks[j].index = j
+                self.task_locations.setdefault((new_dags[i].id, new_dags[i].subtasks[j].id, -1), (j, dags_count + i))
                 new_dags[i].subtasks[j].arrival_time = new_dags[i].arrival_time
                 new_dags[i].subtasks[j].absolute_deadline = (float(new_dags[i].subtasks[j].deadline)
                                                              + new_dags[i].arrival_time) / 1000 + self.start_time
-                self.scheduling_queue.put((
-                    SchedulerPriority(new_dags[i].subtasks[j].deadline + new_dags[i].arrival_time,
-                                      new_dags[i].subtasks[j].task_type),
-                    new_dags[i].arrival_time,
-                    j, i + dags_count, -1))
+            for j in range(len(new_dags[i].subtasks)):
+                if waiting_predecessors[j] == 0:
+                    self.release(j, i + dags_count, -1)
         self.queue_lock.release()
+        self.wakeup.set()
 
     def add_periodic_tasks(self, new_periodic_tasks: list[PeriodicTask]):
         self.queue_lock.acquire()
-        arrival_time = int((time.time() - self.start_time) * 1000 * self.time_scale)
+        arrival_time = int((self.clock() - self.start_time) * 1000 * self.time_scale)
         periodic_tasks_count = len(self.periodic_tasks)
         self.periodic_tasks.extend(new_periodic_tasks)
         for i in range(len(new_periodic_tasks)):
             index = i + periodic_tasks_count
             new_periodic_tasks[i].index = index
+            self.task_locations.setdefault((-1, new_periodic_tasks[i].id, new_periodic_tasks[i].job_id), (index, -1))
             new_periodic_tasks[i].arrival_time = arrival_time
             new_periodic_tasks[i].absolute_deadline = ((float(new_periodic_tasks[i].deadline)
                                                         + new_periodic_tasks[i].arrival_time) / 1000
                                                        + self.start_time)
 
-            self.scheduling_queue.put((
-                SchedulerPriority(new_periodic_tasks[i].deadline + arrival_time,
-                                  new_periodic_tasks[i].task_type),
-                arrival_time, index, -1, 0))
+            self.release(index, -1, 0)
         self.queue_lock.release()
+        self.wakeup.set()
 
     def update_position(self, position: Tuple[int, int]):
         self.position = position
 
     def notify_execute_task(self, current_time: int, task_id: int, workflow_id: int, job_id: int):
+        self.notify_execute_tasks(current_time, [(task_id, workflow_id, job_id)])
 
-        if workflow_id == -1:
-            for task in self.periodic_tasks:
-                if task.id == task_id and task.job_id == job_id:
-                    task.remaining_execution_cost = 0
-                    task.execution_times = [[-1, current_time, current_time]]
-                    task.latency = (time.time() - task.offload_time) * 1000
-                    break
-        else:
-            for dag in self.dags:
-                if dag.id == workflow_id:
-                    for task in dag.subtasks:
-                        if task.id == task_id:
-                            task.remaining_execution_cost = 0
-                            task.execution_times = [[-1, current_time, current_time]]
-                            task.latency = (time.time() - task.offload_time) * 1000
-                            break
-                    break
-
-    def schedule(self, current_time: int, total_time: int):
+    def notify_execute_tasks(self, current_time: int, tasks: list[Tuple[int, int, int]]):
+        self.queue_lock.acquire()
+        for task_id, workflow_id, job_id in tasks:
+            location = self.task_locations.get((workflow_id, task_id, job_id if workflow_id == -1 else -1))
+            if location is None:
+                continue
+            task: SubTask = self.periodic_tasks[location[0]] if location[1] == -1 \
+                else self.dags[location[1]].subtasks[location[0]]
+            task.execution_times = [[-1, current_time, current_time]]
+            task.latency = (self.clock() - task.offload_time) * 1000
+            self.set_finished(task, location[0], location[1])
+        self.queue_lock.release()
+        self.wakeup.set()
+
+    def release(self, task_index: int, workflow_index: int, job_index: int):
+        '''
+        Puts a task whose predecessors are finished into the release calendar, at the time both its release
+        time and its input data are reached. A task still waiting for a predecessor is left to set_finished.
+        '''
+        if (task_index, workflow_index) in self.queued_tasks:
+            return
+        if workflow_index != -1 and self.waiting_predecessors[workflow_index][task_index] > 0:
+            return
+
+        task: SubTask = self.periodic_tasks[task_index] if workflow_index == -1 \
+            else self.dags[workflow_index].subtasks[task_index]
+        if task.offload_time is not None or (task.remaining_execution_cost == 0 and len(task.execution_times) > 0):
+            # already placed
+            return
+
+        ready_time = max(task.arrival_time, self.data_availability(task.arrival_time, task_index, workflow_index))
+        if ready_time == math.inf:
+            # released again once the unfinished predecessor is placed
+            return
+        self.queued_tasks.add((task_index, workflow_index))
+        heapq.heappush(self.release_calendar, (ready_time, workflow_index, task_index, job_index))
+
+    def set_finished(self, task: SubTask, task_index: int, workflow_index: int):
+        '''
+        Marks the task as finished and releases the successors it was the last unfinished predecessor of.
+        '''
+        if task.remaining_execution_cost == 0:
+            return
+        task.remaining_execution_cost = 0
 
+        if workflow_index == -1:
+            return
+        dag = self.dags[workflow_index]
+        waiting_predecessors = self.waiting_predecessors[workflow_index]
+        for k in range(dag.successor_offsets[task_index], dag.successor_offsets[task_index + 1]):
+            successor = dag.successor_indices[k]
+            waiting_predecessors[successor] -= 1
+            if waiting_predecessors[successor] == 0:
+                self.release(successor, workflow_index, -1)
+
+    def set_preempted(self, task: SubTask, task_index: int, workflow_index: int, job_index: int,
+                      execution_cost: int):
+        '''
+        Gives back the preempted execution cost to the task and blocks its successors until it finishes again.
+        '''
+        finished = task.remaining_execution_cost == 0
+        task.remaining_execution_cost += execution_cost
+        if finished and task.remaining_execution_cost != 0 and workflow_index != -1:
+            dag = self.dags[workflow_index]
+            waiting_predecessors = self.waiting_predecessors[workflow_index]
+            for k in range(dag.successor_offsets[task_index], dag.successor_offsets[task_index + 1]):
+                waiting_predecessors[dag.successor_indices[k]] += 1
+        self.preempted_tasks.append((task_index, workflow_index, job_index))
+
+    def schedule(self, current_time: int, total_time: int) -> float:
+        '''
+        Schedules every ready task and returns the next time at which a waiting task becomes ready
+        (math.inf when only an arrival or a completion notification can unblock the queue).
+        '''
         self.queue_lock.acquire()
-        q_size = self.scheduling_queue.qsize()
-        for i in range(q_size):
-            priority, release_time, task_index, workflow_index, job_index = self.scheduling_queue.get()
-            if current_time < release_time:
-                self.backup_queue.put((priority, release_time, task_index, workflow_index, job_index))
-            elif current_time < self.data_availability(current_time, task_index, workflow_index):
-                self.backup_queue.put((priority, release_time, task_index, workflow_index, job_index))
-            else:
-                self.schedule_subtask(current_time, total_time, task_index, workflow_index, job_index)
-        while not self.backup_queue.empty():
-            self.scheduling_queue.put(self.backup_queue.get())
+        # nothing can be placed before the current time anymore
+        for p in self.processors:
+            p.retire_allocations(current_time)
+
+        while True:
+            # move the tasks whose release time and input data are reached to the scheduling queue
+            while len(self.release_calendar) > 0 and self.release_calendar[0][0] <= current_time:
+                _, workflow_index, task_index, job_index = heapq.heappop(self.release_calendar)
+                task: SubTask = self.periodic_tasks[task_index] if workflow_index == -1 \
+                    else self.dags[workflow_index].subtasks[task_index]
+                self.scheduling_queue.put((SchedulerPriority(task.deadline + task.arrival_time, task.task_type),
+                                           task.arrival_time, task_index, workflow_index, job_index))
+
+            if self.scheduling_queue.empty():
+                break
+
+            _, _, task_index, workflow_index, job_index = self.scheduling_queue.get()
+            self.queued_tasks.discard((task_index, workflow_index))
+            if workflow_index != -1 and self.waiting_predecessors[workflow_index][task_index] > 0:
+                # a predecessor got preempted meanwhile, the task is released again once it finishes
+                continue
+            if current_time < self.data_availability(current_time, task_index, workflow_index):
+                # a predecessor got rescheduled to a later finish time
+                self.release(task_index, workflow_index, job_index)
+                continue
 
+            self.schedule_subtask(current_time, total_time, task_index, workflow_index, job_index)
+
+        for preempted_task in self.preempted_tasks:
+            self.release(*preempted_task)
+        self.preempted_tasks.clear()
+
+        next_event_time = self.release_calendar[0][0] if len(self.release_calendar) > 0 else math.inf
         self.queue_lock.release()
 
-    def data_availability(self, current_time: int, task_index: int, workflow_index: int) -> int:
+        return next_event_time
+
+    def data_availability(self, current_time: int, task_index: int, workflow_index: int) -> float:
         if workflow_index == -1:
             return 0
 
         data_available = 0
-        predecessors = [(edge[0], edge[2]) for edge
-                        in self.dags[workflow_index].edges
-                        if edge[1] == task_index]
-
-        for predecessor in predecessors:
-            task = self.dags[workflow_index].subtasks[predecessor[0]]
+        dag = self.dags[workflow_index]
+        for k in range(dag.predecessor_offsets[task_index], dag.predecessor_offsets[task_index + 1]):
+            task = dag.subtasks[dag.predecessor_indices[k]]
             if task.remaining_execution_cost != 0:
-                return current_time + 1
+                # ready once the predecessor is scheduled or its offload is notified
+                return math.inf
 
             if task.execution_cost == 0:
                 # dummy task
@@ -150,20 +261,20 @@ class Scheduler:
         task: SubTask = self.periodic_tasks[task_index] if workflow_index == -1 \
             else self.dags[workflow_index].subtasks[task_index]
 
+        eft_placement: list[Tuple[PlacementOperation, int, int, int]] = []
         for p in self.processors:
-            eft_candidate = self.eft(p, start_time, task_index, workflow_index, job_index, True)
+            eft_candidate, placement = self.eft(p, start_time, task_index, workflow_index, job_index)
             if eft_candidate < eft:
                 eft = eft_candidate
                 eft_processor = p
+                eft_placement = placement
 
         if task.task_type != TaskType.HARD and len(task.execution_times) == 0 and \
                 eft > task.deadline + task.arrival_time and task.execution_cost != 0 \
                 and task.deadline + task.arrival_time > start_time + 1000:
             self.offload(task)
         else:
-            new_eft = self.eft(eft_processor, start_time, task_index, workflow_index, job_index, False)
-            if eft != new_eft:
-                print("Warning: Code 24")
+            self.apply_placement(eft_processor, eft, task_index, workflow_index, job_index, eft_placement)
 
         if workflow_index == -1:
             for i in range(task_index + 1, len(self.periodic_tasks)):
@@ -179,13 +290,15 @@ class Scheduler:
             if job.deadline + job.arrival_time >= total_time:
                 return
             self.periodic_tasks.append(job)
-            self.scheduling_queue.put((
-                SchedulerPriority(job.deadline + job.arrival_time, job.task_type),
-                job.arrival_time, job.index, -1, job.job_index))
-
-    def eft(self, p: Processor, start_time: int, task_index: int, workflow_index: int, job_index: int,
-            only_check: bool) -> int:
-
+            self.task_locations.setdefault((-1, job.id, job.job_id), (job.index, -1))
+            self.release(job.index, -1, job.job_index)
+
+    def eft(self, p: Processor, start_time: int, task_index: int, workflow_index: int,
+            job_index: int) -> (int, list[Tuple[PlacementOperation, int, int, int]]):
+        '''
+        Returns the earliest finish time of the task on the processor and the placement that achieves it, without
+        changing the processor or the tasks.
+        '''
         task: SubTask = self.periodic_tasks[task_index] if workflow_index == -1 \
             else self.dags[workflow_index].subtasks[task_index]
 
@@ -193,9 +306,18 @@ class Scheduler:
         start_time_temp = start_time
         if len(task.execution_times) > 0:
             start_time_temp = max(start_time_temp, task.execution_times[-1][2])
+        # [0: operation, 1: allocation index once the previous operations are applied, 2: start time, 3: end time]
+        placement: list[Tuple[PlacementOperation, int, int, int]] = []
+        # allocations inserted minus allocations removed by the placement so far
+        shift = 0
         index = -1
-        i = 0
-        prev_scheduled_task: SubTask | None = None
+        # skip the allocations that end before the task can start
+        i = p.find_allocation(start_time_temp)
+        prev_scheduled_task: SubTask | None = None if i == 0 else \
+            self.periodic_tasks[p.allocations[i - 1][0]] if p.allocations[i - 1][1] == -1 else \
+            self.dags[p.allocations[i - 1][1]].subtasks[p.allocations[i - 1][0]]
+        # whether the allocation right before i belongs to the task once the placement is applied
+        prev_allocation_of_task = prev_scheduled_task is not None and prev_scheduled_task == task
 
         while True:
             if i >= len(p.allocations):
@@ -210,6 +332,7 @@ class Scheduler:
             if p.allocations[i][4] <= start_time_temp:
                 i += 1
                 prev_scheduled_task = scheduled_task
+                prev_allocation_of_task = scheduled_task == task
                 continue
 
             if p.allocations[i][3] >= start_time_temp + execution_time:
@@ -219,15 +342,12 @@ class Scheduler:
             elif p.allocations[i][3] > start_time_temp:
                 execution_time = execution_time - (p.allocations[i][3] - start_time_temp)
                 finish_time = p.allocations[i][3]
-                if not only_check:
-                    if prev_scheduled_task is None or prev_scheduled_task != task:
-                        p.allocations.insert(i, [task_index, workflow_index,
-                                                 job_index, start_time_temp, finish_time])
-                        task.execution_times.append([p.index, start_time_temp, finish_time])
-                        i = i + 1
-                    else:
-                        task.execution_times[-1][2] = finish_time
-                        p.allocations[i - 1][4] = finish_time
+                if prev_scheduled_task is None or prev_scheduled_task != task:
+                    placement.append((PlacementOperation.Insert, i + shift, start_time_temp, finish_time))
+                    shift += 1
+                else:
+                    placement.append((PlacementOperation.Extend, i + shift - 1, start_time_temp, finish_time))
+                prev_allocation_of_task = True
                 start_time_temp = finish_time
 
             elif p.allocations[i][3] == start_time_temp:
@@ -245,30 +365,15 @@ class Scheduler:
                     else:
                         finish_time = p.allocations[i][4]
                         execution_time = execution_time - (p.allocations[i][4] - start_time_temp)
-                    if not only_check:
-                        scheduled_task.remaining_execution_cost += p.get_execution_cost(
-                            p.allocations[i][4] - start_time_temp
-                        )
-                        for e in range(len(scheduled_task.execution_times)):
-                            if scheduled_task.execution_times[e][2] == p.allocations[i][4]:
-                                del scheduled_task.execution_times[e]
-                                break
-                        self.scheduling_queue.put(
-                            (SchedulerPriority(scheduled_task.deadline + scheduled_task.arrival_time,
-                                               scheduled_task.task_type),
-                             0, p.allocations[i][0], p.allocations[i][1], p.allocations[i][2])
-                        )
-                        del p.allocations[i]
-                        if prev_scheduled_task is None or prev_scheduled_task != task:
-                            p.allocations.insert(i, [task_index, workflow_index, job_index,
-                                                     start_time_temp, finish_time])
-                            task.execution_times.append([p.index, start_time_temp, finish_time])
-                            i = i + 1
-                        else:
-                            task.execution_times[-1][2] = finish_time
-                            p.allocations[i - 1][4] = finish_time
-                    if only_check:
-                        i = i + 1
+                    placement.append((PlacementOperation.Remove, i + shift, start_time_temp, start_time_temp))
+                    shift -= 1
+                    if prev_scheduled_task is None or prev_scheduled_task != task:
+                        placement.append((PlacementOperation.Insert, i + 1 + shift, start_time_temp, finish_time))
+                        shift += 1
+                    else:
+                        placement.append((PlacementOperation.Extend, i + shift, start_time_temp, finish_time))
+                    i = i + 1
+                    prev_allocation_of_task = True
                     start_time_temp = finish_time
 
             else:
@@ -285,71 +390,97 @@ class Scheduler:
                     else:
                         finish_time = p.allocations[i][4]
                         execution_time = execution_time - (p.allocations[i][4] - start_time_temp)
-                    if not only_check:
-                        scheduled_task.remaining_execution_cost += p.get_execution_cost(
-                            p.allocations[i][4] - start_time_temp
-                        )
-                        for e in scheduled_task.execution_times:
-                            if e[2] == p.allocations[i][4]:
-                                e[2] = start_time_temp
-                                break
-                        self.scheduling_queue.put(
-                            (SchedulerPriority(scheduled_task.deadline + scheduled_task.arrival_time,
-                                               scheduled_task.task_type),
-                             0, p.allocations[i][0], p.allocations[i][1], p.allocations[i][2])
-                        )
-                        p.allocations[i][4] = start_time_temp
-
-                        p.allocations.insert(i + 1,
-                                             [task_index, workflow_index, job_index, start_time_temp, finish_time])
-                        task.execution_times.append([p.index, start_time_temp, finish_time])
-                        i = i + 2
-                    if only_check:
-                        i = i + 1
+                    placement.append((PlacementOperation.Truncate, i + shift, start_time_temp, start_time_temp))
+                    placement.append((PlacementOperation.Insert, i + shift + 1, start_time_temp, finish_time))
+                    shift += 1
+                    i = i + 1
+                    prev_allocation_of_task = True
                     start_time_temp = finish_time
 
         eft = start_time_temp + execution_time
         index = len(p.allocations) if index == -1 else index
-        if execution_time != 0 and not only_check:
-            prev_scheduled_task: SubTask | None = None if index == 0 else \
-                self.periodic_tasks[p.allocations[index - 1][0]] if p.allocations[index - 1][1] == -1 else \
-                    self.dags[p.allocations[index - 1][1]].subtasks[p.allocations[index - 1][0]]
-
-            if prev_scheduled_task is None or prev_scheduled_task != task:
-                p.allocations.insert(index, [task_index, workflow_index, job_index, start_time_temp, eft])
-                task.execution_times.append([p.index, start_time_temp, eft])
+        if execution_time != 0:
+            if not prev_allocation_of_task:
+                placement.append((PlacementOperation.Insert, index + shift, start_time_temp, eft))
             else:
-                task.execution_times[-1][2] = eft
-                p.allocations[index - 1][4] = eft
+                placement.append((PlacementOperation.Extend, index + shift - 1, start_time_temp, eft))
+
+        return eft, placement
 
-        if execution_time == 0 and not only_check and len(task.execution_times) == 0:
-            task.execution_times.append([p.index, start_time_temp, start_time_temp])
+    def apply_placement(self, p: Processor, eft: int, task_index: int, workflow_index: int, job_index: int,
+                        placement: list[Tuple[PlacementOperation, int, int, int]]):
+        '''
+        Places the task on the processor as planned by eft, preempting the allocations in its way.
+        '''
+        task: SubTask = self.periodic_tasks[task_index] if workflow_index == -1 \
+            else self.dags[workflow_index].subtasks[task_index]
+
+        for operation, index, start_time, end_time in placement:
+            if operation == PlacementOperation.Insert:
+                p.insert_allocation(index, [task_index, workflow_index, job_index, start_time, end_time])
+                task.execution_times.append([p.index, start_time, end_time])
+            elif operation == PlacementOperation.Extend:
+                task.execution_times[-1][2] = end_time
+                p.resize_allocation(index, end_time)
+            else:
+                allocation = p.allocations[index]
+                scheduled_task: SubTask = self.periodic_tasks[allocation[0]] if allocation[1] == -1 else \
+                    self.dags[allocation[1]].subtasks[allocation[0]]
+                self.set_preempted(scheduled_task, allocation[0], allocation[1], allocation[2],
+                                   p.get_execution_cost(allocation[4] - end_time))
+                for e in range(len(scheduled_task.execution_times)):
+                    if scheduled_task.execution_times[e][2] == allocation[4]:
+                        if operation == PlacementOperation.Remove:
+                            del scheduled_task.execution_times[e]
+                        else:
+                            scheduled_task.execution_times[e][2] = end_time
+                        break
+                if operation == PlacementOperation.Remove:
+                    p.remove_allocation(index)
+                else:
+                    p.resize_allocation(index, end_time)
 
-        if not only_check:
-            task.remaining_execution_cost = 0
+        if len(task.execution_times) == 0:
+            task.execution_times.append([p.index, eft, eft])
 
-        return eft
+        self.set_finished(task, task_index, workflow_index)
 
     def offload(self, task: SubTask):
-        nearest_fog = None
-        nearest_dis = math.inf
-        for i in range(len(self.fogs)):
-            fog = self.fogs[i]
-            if fog.is_in_range(self.position[0], self.position[1]):
-                dis = fog.distance(self.position[0], self.position[1])
-                if dis < nearest_dis:
-                    nearest_dis = dis
-                    nearest_fog = fog
+        nearest_fog = self.fog_index.nearest_in_range(self.position[0], self.position[1])
+
+        prediction = None
+        if self.mobility_predictor is not None and nearest_fog is not None:
+            # the result comes back by the deadline at the latest, the device should still be covered then
+            prediction = self.mobility_predictor.predict(task.deadline + task.arrival_time)
+        if prediction is not None:
+            predicted_position, spread = prediction
+            # nearest fog covering the whole predicted area, else the nearest covering the predicted position, else
+            # the nearest covering the device now
+            predicted_fog = None
+            nearest_rank = (math.inf, math.inf)
+            for i in self.fog_index.in_range(self.position[0], self.position[1]):
+                fog = self.fogs[i]
+                if not fog.is_in_range(predicted_position[0], predicted_position[1]):
+                    continue
+                covered = math.dist((fog.position_x, fog.position_y), predicted_position) + spread \
+                    <= fog.coverage_area
+                rank = (0 if covered else 1, fog.distance(self.position[0], self.position[1]))
+                if rank < nearest_rank:
+                    nearest_rank = rank
+                    predicted_fog = fog
+            if predicted_fog is not None:
+                nearest_fog = predicted_fog
 
         if nearest_fog is not None:
             # offload on the nearest fog
             nearest_fog.offload(self.back_address, task)
-            task.offload_time = time.time()
+            task.offload_time = self.clock()
 
         else:
             # offload on cloud
             self.cloud.offload(self.back_address, task)
-            task.offload_time = time.time()
+            task.offload_time = self.clock()
 
     def update_network(self):
         self.fogs = self.cloud.get_nodes()
+        self.fog_index = FogIndex(self.fogs)
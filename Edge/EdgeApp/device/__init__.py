@@ -5,7 +5,9 @@ import threading
 import time
 from enum import Enum
 
-from .mobility import random_walk, levy_walk, WalkMode
+import numpy as np
+
+from .mobility import Walker, WalkMode
 from ..algorithms.FuzzyScheduler import FuzzyScheduler
 from ..algorithms.HEScheduler import HEScheduler
 from ..algorithms.RandomScheduler import RandomScheduler
@@ -14,9 +16,13 @@ from ..dtos import PeriodicTaskSerializer
 from ..dtos.DagSerializer import DagSerializer
 from ..types.Cloud import Cloud
 from ..types.DAG import DAG
+from ..types.OffloadDispatcher import OffloadDispatcher
 from ..types.PeriodicTask import PeriodicTask
+from ..types.MobilityPredictor import MobilityPredictor
+from ..types.PositionHistory import PositionHistory
 from ..types.PreemptionType import PreemptionType
 from ..types.Processor import Processor
+from ..types.ProcessorProfiles import create_processors
 from ..types.SubTask import SubTask
 
 
@@ -31,7 +37,6 @@ class _Device:
         self.cloud_address: str = os.environ.get('CLOUD_ADDRESS')
         self.back_address = os.environ.get('ADDRESS')
 
-        self.positions: list[tuple[int | None, int | None]] = []
         self.walk_model: str | None = None
         self.status = DeviceStatus.IDLE
         self.start_time: float = 0
@@ -40,6 +45,10 @@ class _Device:
         self.scheduler_total_time: int = int(os.environ.get('SCHEDULER_TOTAL_TIME', 50_000))
         self.walk_model: str = os.environ.get('WALK_MODE', WalkMode.Random)
         self.speed: float = float(os.environ.get('SPEED', 1.0))
+        # steps generated at once by the walk thread
+        self.walk_block_size: int = int(os.environ.get('WALK_BLOCK_SIZE', 4096))
+        # last positions kept for the position endpoint
+        self.position_history_size: int = int(os.environ.get('POSITION_HISTORY_SIZE', 100))
         self.preemption_type = PreemptionType[os.environ.get('PREEMPTION_TYPE', 'Lazy')]
         self.algorithm: str = "MEES"
         self.output_name: str = ""
@@ -51,49 +60,18 @@ class _Device:
         start_position_y = random.randint(0, position_y_max)
         self.max_position = (position_x_max, position_y_max)
         self.start_position = (start_position_x, start_position_y)
-        self.positions = [(start_position_x, start_position_y)]
+        self.positions = PositionHistory(self.position_history_size)
+        self.positions.append(self.start_position)
+        self.walker = Walker(self.walk_model, self.start_position, self.max_position, self.walk_block_size)
 
         # init processor characteristics
         self.bus_bandwidth = int(os.environ.get('BUS_BANDWIDTH', 100))
 
         processor_type = int(os.environ.get('PROCESSOR_TYPE', 0))
-        if processor_type == 0 or processor_type == 1:
-            processor_cores = 4
-            processor_frequency = 1.5
-            memory = 2 if processor_type == 0 else 4
-            active_power = 8
-            idle_power = 2.7
-        elif processor_type == 2:
-            processor_cores = 4
-            processor_frequency = 1.4
-            memory = 1
-            active_power = 4.5
-            idle_power = 2
-        elif processor_type == 3:
-            processor_cores = 4
-            processor_frequency = 2.83
-            memory = 4
-            active_power = 118
-            idle_power = 56.7
-        elif processor_type == 4:
-            processor_cores = 4
-            processor_frequency = 2.83
-            memory = 2
-            active_power = 95.4
-            idle_power = 49.6
-        else:
-            processor_cores = 4
-            processor_frequency = 2.4
-            memory = 2 if processor_type == 5 else 4
-            active_power = 9
-            idle_power = 2.75
-
-        self.processors: list[Processor] = []
-        for i in range(processor_cores):
-            self.processors.append(Processor(i, processor_frequency, memory, active_power, idle_power))
+        self.processors: list[Processor] = create_processors(processor_type)
 
         # init scheduling algorithm
-        self.cloud = Cloud(self.cloud_address)
+        self.cloud = Cloud(self.cloud_address, OffloadDispatcher())
         self.cloud.register(self.back_address)
         self.scheduler = None
 
@@ -118,7 +96,12 @@ class _Device:
 
         self.scheduler.start_time = self.start_time
         self.scheduler.clear()
-        self.positions = [self.start_position]
+        self.positions = PositionHistory(self.position_history_size)
+        self.positions.append(self.start_position)
+        if isinstance(self.scheduler, Scheduler):
+            self.scheduler.mobility_predictor = MobilityPredictor(self.positions, self.walk_model, self.speed,
+                                                                  self.max_position)
+        self.walker = Walker(self.walk_model, self.start_position, self.max_position, self.walk_block_size)
 
         _thread = threading.Thread(target=self.run, args=())
         _thread.start()
@@ -143,19 +126,21 @@ class _Device:
             periodic_tasks.append(periodic_task)
         self.scheduler.add_periodic_tasks(periodic_tasks)
 
-    def get_last_positions(self, max_count: int) -> list[tuple[int | None, int | None]]:
-        if max_count > len(self.positions):
-            if len(self.positions) > 0:
-                return self.positions
-            else:
-                return [(None, None)]
+    def get_last_positions(self, max_count: int) -> np.ndarray | list[tuple[int | None, int | None]]:
+        if len(self.positions) == 0:
+            return [(None, None)]
 
-        return self.positions[len(self.positions) - max_count:]
+        # the walk thread keeps appending while the response is serialized
+        return self.positions.last_positions(max_count).copy()
 
     def notify_execute_task(self, task_id: int, workflow_id: int, job_id: int):
         current_time = int((time.time() - self.start_time) * 1000 * self.time_scale)
         self.scheduler.notify_execute_task(current_time, task_id, workflow_id, job_id)
 
+    def notify_execute_tasks(self, tasks: list[tuple[int, int, int]]):
+        current_time = int((time.time() - self.start_time) * 1000 * self.time_scale)
+        self.scheduler.notify_execute_tasks(current_time, tasks)
+
     def run(self):
         # Simulation of the device's walking steps
         _walk_thread = threading.Thread(target=self.walk, args=())
@@ -166,7 +151,6 @@ class _Device:
         _scheduler_thread.start()
 
     def walk(self):
-        total_stored_steps = 100
         remaining_steps: float = 0
 
         while DEVICE.status == DeviceStatus.RUNNING:
@@ -174,12 +158,8 @@ class _Device:
             if remaining_steps > 1:
                 steps = int(remaining_steps)
                 remaining_steps = remaining_steps - steps
-                if self.walk_model == "Random":
-                    self.positions.append(random_walk(steps, self.positions[-1], self.max_position))
-                else:
-                    self.positions.append(levy_walk(steps, self.positions[-1], self.max_position))
-            if len(self.positions) > total_stored_steps:
-                del self.positions[:total_stored_steps // 2]
+                current_time = int((time.time() - self.start_time) * 1000 * self.time_scale)
+                self.positions.append(self.walker.advance(steps), current_time)
 
             time.sleep(1 / (1000 * self.time_scale))
 
@@ -187,13 +167,22 @@ class _Device:
         self.scheduler.update_network()
 
         while DEVICE.status == DeviceStatus.RUNNING:
+            # cleared before scheduling so arrivals during the round are not missed
+            self.scheduler.wakeup.clear()
+
             current_time = int((time.time() - self.start_time) * 1000 * self.time_scale)
-            self.scheduler.update_position((self.positions[-1][0], self.positions[-1][1]))
-            self.scheduler.schedule(current_time, self.scheduler_total_time)
+            self.scheduler.update_position(self.positions.last())
+            next_event_time = self.scheduler.schedule(current_time, self.scheduler_total_time)
 
             if current_time > self.total_time:
                 DEVICE.status = DeviceStatus.STOPPED
                 self.result()
+                break
+
+            # sleep until the next known release/data-availability time, a new arrival or completion,
+            # or the end of the run
+            next_event_time = min(next_event_time, self.total_time + 1)
+            self.scheduler.wakeup.wait(max(next_event_time - current_time, 0) / (1000 * self.time_scale))
 
     def result(self):
         tasks_json = []
@@ -237,7 +226,7 @@ class _Device:
         processors_json = []
         for processor in self.processors:
             allocations_json = []
-            for allocation in processor.allocations:
+            for allocation in processor.get_allocations():
                 task = self.scheduler.periodic_tasks[allocation[0]] if allocation[1] == -1 else \
                     self.scheduler.dags[allocation[1]].subtasks[allocation[0]]
                 allocations_json.append({
@@ -262,7 +251,7 @@ class _Device:
         for p in self.processors:
             print(f"Processing unit {p.index}:")
             total_active = 0
-            for allocation in p.allocations:
+            for allocation in p.get_allocations():
                 total_active += allocation[4] - allocation[3]
                 dag_id = -1 if allocation[1] == -1 else self.scheduler.dags[allocation[1]].id
                 task = self.scheduler.periodic_tasks[allocation[0]] if allocation[1] == -1 else \
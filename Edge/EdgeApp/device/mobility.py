@@ -9,6 +9,82 @@ class WalkMode(Enum):
     Levy = "Levy"
 
 
+def bounded_walk(start: int, steps: np.ndarray, high: int, window: int = 128) -> np.ndarray:
+    """
+    Positions visited by a 1D walk clamped to [0, high] after every step, as a cumulative sum restarted at each
+    clamp.
+
+    Parameters:
+    start (int): The starting position of the walk.
+    steps (np.ndarray): The integer steps of the walk.
+    high (int): The maximum allowed position of the walk.
+    window (int): The number of steps summed at once, bounding the work redone after a clamp (default is 128).
+
+    Returns:
+    The position after each step.
+    """
+    positions = np.empty(len(steps), dtype=np.int64)
+    position = start
+    i = 0
+    while i < len(steps):
+        walked = position + np.cumsum(steps[i:i + window])
+        out = (walked < 0) | (walked > high)
+        if not out.any():
+            positions[i:i + len(walked)] = walked
+            position = int(walked[-1])
+            i += len(walked)
+            continue
+
+        # exact up to the first step leaving the area, which is clamped before walking on
+        j = int(np.argmax(out))
+        positions[i:i + j] = walked[:j]
+        position = min(max(int(walked[j]), 0), high)
+        positions[i + j] = position
+        i += j + 1
+
+    return positions
+
+
+def random_steps(steps: int) -> np.ndarray:
+    """
+    Draws the steps of a 2D random walk, one of -1, 0 or 1 on each axis.
+
+    Returns:
+    An array of shape (steps, 2).
+    """
+    return np.random.choice([-1, 0, 1], size=(steps, 2))
+
+
+def levy_steps(steps: int, max_position: tuple[int, int], scale: float = 2, location: float = 0) -> np.ndarray:
+    """
+    Draws the steps of a 2D Lévy walk, with lengths from the Lévy distribution and uniform directions. The steps are
+    floored since the walk truncates its integer position after every step, and capped at the area size since any
+    longer step is clamped to the border anyway.
+
+    Returns:
+    An array of shape (steps, 2).
+    """
+    step_length = levy.rvs(scale=scale, loc=location, size=steps)
+    theta = np.random.uniform(0, 2 * np.pi, size=steps)
+    limit = max(max_position[0], max_position[1]) + 1
+    dx = np.clip(np.floor(step_length * np.cos(theta)), -limit, limit)
+    dy = np.clip(np.floor(step_length * np.sin(theta)), -limit, limit)
+    return np.stack((dx, dy), axis=1).astype(np.int64)
+
+
+def walk_positions(steps: np.ndarray, start_position: tuple[int, int], max_position: tuple[int, int]) -> np.ndarray:
+    """
+    Positions visited by a 2D walk kept inside the area (0, 0)-max_position.
+
+    Returns:
+    An array of shape (len(steps), 2).
+    """
+    positions = np.empty((len(steps), 2), dtype=np.int64)
+    positions[:, 0] = bounded_walk(start_position[0], steps[:, 0], max_position[0])
+    positions[:, 1] = bounded_walk(start_position[1], steps[:, 1], max_position[1])
+    return positions
+
+
 def random_walk(steps: int = 1, start_position: tuple[int, int] = (0, 0), max_position: tuple[int, int] = (1000, 1000)) -> \
 tuple[int, int]:
     """
@@ -22,16 +98,11 @@ tuple[int, int]:
     Returns:
     The last position of the random walk.
     """
-    last_position: tuple[int, int] = (start_position[0], start_position[1])
+    if steps <= 0:
+        return start_position[0], start_position[1]
 
-    for _ in range(steps):
-        dx = np.random.choice([-1, 0, 1])
-        dy = np.random.choice([-1, 0, 1])
-        new_x = int(min(max(last_position[0] + dx, 0), max_position[0]))
-        new_y = int(min(max(last_position[1] + dy, 0), max_position[1]))
-        last_position = (new_x, new_y)
-
-    return last_position
+    positions = walk_positions(random_steps(steps), start_position, max_position)
+    return int(positions[-1, 0]), int(positions[-1, 1])
 
 
 def levy_walk(steps: int = 1, start_position: tuple[int, int] = (0, 0), max_position: tuple[int, int] = (1000, 1000),
@@ -49,19 +120,50 @@ def levy_walk(steps: int = 1, start_position: tuple[int, int] = (0, 0), max_posi
     Returns:
     The last position of the random walk.
     """
-    last_position: tuple[int, int] = (start_position[0], start_position[1])
+    if steps <= 0:
+        return start_position[0], start_position[1]
 
-    for _ in range(steps):
-        # Generate a random step length from the Levy distribution
-        step_length = levy.rvs(scale=scale, loc=location)
+    positions = walk_positions(levy_steps(steps, max_position, scale, location), start_position, max_position)
+    return int(positions[-1, 0]), int(positions[-1, 1])
 
-        # Generate a random direction
-        theta = np.random.uniform(0, 2 * np.pi)
-        dx = step_length * np.cos(theta)
-        dy = step_length * np.sin(theta)
 
-        new_x = int(min(max(last_position[0] + dx, 0), max_position[0]))
-        new_y = int(min(max(last_position[1] + dy, 0), max_position[1]))
-        last_position = (new_x, new_y)
+class Walker:
+    """
+    Serves the positions of a walk from blocks generated ahead of time, so advancing the walk is an index lookup
+    instead of drawing every step in Python.
+    """
 
-    return last_position
+    def __init__(self, walk_model: str, start_position: tuple[int, int], max_position: tuple[int, int],
+                 block_size: int = 4096):
+        self.walk_model = walk_model
+        self.max_position = max_position
+        self.block_size = block_size
+        self.position: tuple[int, int] = (start_position[0], start_position[1])
+        self.block: np.ndarray = np.empty((0, 2), dtype=np.int64)
+        # index of the next unused position in the block
+        self.cursor = 0
+
+    def generate(self):
+        if self.walk_model == "Random":
+            steps = random_steps(self.block_size)
+        else:
+            steps = levy_steps(self.block_size, self.max_position)
+        self.block = walk_positions(steps, self.position, self.max_position)
+        self.cursor = 0
+
+    def advance(self, steps: int) -> tuple[int, int]:
+        """
+        Takes the given number of steps.
+
+        Returns:
+        The position after the last step.
+        """
+        while steps > 0:
+            if self.cursor == len(self.block):
+                self.generate()
+            taken = min(steps, len(self.block) - self.cursor)
+            self.cursor += taken
+            steps -= taken
+            self.position = (int(self.block[self.cursor - 1, 0]), int(self.block[self.cursor - 1, 1]))
+
+        return self.position
@@ -0,0 +1,7 @@
+from rest_framework import serializers
+
+
+class ExecutedTaskSerializer(serializers.Serializer):
+    taskId = serializers.IntegerField()
+    workflowId = serializers.IntegerField()
+    jobId = serializers.IntegerField()
@@ -2,6 +2,7 @@ from rest_framework import serializers
 
 from .device import WalkMode
 from .dtos.DagSerializer import DagSerializer
+from .dtos.ExecutedTaskSerializer import ExecutedTaskSerializer
 from .dtos.PeriodicTaskSerializer import PeriodicTaskSerializer
 
 
@@ -36,3 +37,7 @@ class EdgeSerializer:
             taskId = serializers.IntegerField()
             workflowId = serializers.IntegerField()
             jobId = serializers.IntegerField()
+
+    class NotifyExecuteTasks:
+        class NotifyExecuteTasksRequest(serializers.Serializer):
+            tasks = serializers.ListField(child=ExecutedTaskSerializer())
@@ -1,16 +1,17 @@
 import json
-import threading
 
 import requests
 
 from .Fog import Fog
+from .OffloadDispatcher import OffloadDispatcher
 from ..types.SubTask import SubTask
 
 
 class Cloud:
 
-    def __init__(self, cloud_address):
+    def __init__(self, cloud_address, dispatcher: OffloadDispatcher):
         self.address = cloud_address
+        self.dispatcher = dispatcher
 
     def get_nodes(self):
         url = f"http://{self.address}/CloudApp/Cloud/config/getNodes/"
@@ -24,7 +25,7 @@ class Cloud:
         if response.status_code == 200:
             response_json = response.json()
             for fog in response_json['fogs']:
-                fogs.append(Fog(fog))
+                fogs.append(Fog(fog, self.dispatcher))
 
         else:
             print(f"Failed to get data from cloud: {url}")
@@ -53,33 +54,16 @@ class Cloud:
     def offload(self, back_address: str, task: SubTask):
 
         data = {
-            "task": {
-                "id": task.id,
-                "workflowId": task.workflow_id,
-                "jobId": task.job_id,
-                "type": task.task_type.name,
-                "executionCost": task.execution_cost,
-                "memory": task.memory,
-                "absoluteDeadline": task.absolute_deadline
-            },
-            "edgeAddress": back_address,
+            "id": task.id,
+            "workflowId": task.workflow_id,
+            "jobId": task.job_id,
+            "type": task.task_type.name,
+            "executionCost": task.execution_cost,
+            "memory": task.memory,
+            "absoluteDeadline": task.absolute_deadline
         }
 
-        url = f"http://{self.address}/CloudApp/Cloud/tasks/pushTask/"
-        json_data = json.dumps(data)
-        headers = {
-            'Content-Type': 'application/json'
-        }
-
-        def request():
-            response = requests.post(url, data=json_data, headers=headers)
-
-            if response.status_code == 200:
-                print(
-                    f"Task {task.id} | Job {task.job_id} | DAG {task.workflow_id} | D {task.deadline + task.arrival_time}"
-                    f" submitted successfully on the Cloud {self.address}")
-            else:
-                print(f"Failed to submit data: {response.status_code}")
-
-        _thread = threading.Thread(target=request, args=())
-        _thread.start()
+        url = f"http://{self.address}/CloudApp/Cloud/tasks/pushTasks/"
+        description = (f"Task {task.id} | Job {task.job_id} | DAG {task.workflow_id} | "
+                       f"D {task.deadline + task.arrival_time} on the Cloud {self.address}")
+        self.dispatcher.dispatch(url, back_address, data, description)
@@ -16,7 +16,35 @@ class DAG:
         self.id: int = dto['id']
         self.deadline: int = dto['deadline']
         self.arrival_time: int = dto['arrivalTime']
+        # [0: from subtask, 1: to subtask, 2: data size]
         self.edges: list[list[int]] = dto['edges']
         self.subtasks: list[DAGSubTask] = []
         for subtask in dto['subtasks']:
             self.subtasks.append(DAGSubTask(self.id, subtask))
+
+        # CSR adjacency: the predecessors of subtask i are
+        # predecessor_indices[predecessor_offsets[i]:predecessor_offsets[i + 1]], the data they send is at the same
+        # positions of predecessor_data_sizes, and the same goes for the successors
+        self.predecessor_offsets, self.predecessor_indices, self.predecessor_data_sizes = self.build_adjacency(1, 0)
+        self.successor_offsets, self.successor_indices, self.successor_data_sizes = self.build_adjacency(0, 1)
+
+    def build_adjacency(self, source: int, target: int) -> (list[int], list[int], list[int]):
+        '''
+        Groups the edges by their source end, keeping the order of the edge list within each group.
+        '''
+        offsets = [0 for _ in range(len(self.subtasks) + 1)]
+        for edge in self.edges:
+            offsets[edge[source] + 1] += 1
+        for i in range(len(self.subtasks)):
+            offsets[i + 1] += offsets[i]
+
+        indices = [0 for _ in self.edges]
+        data_sizes = [0 for _ in self.edges]
+        positions = offsets[:-1]
+        for edge in self.edges:
+            position = positions[edge[source]]
+            indices[position] = edge[target]
+            data_sizes[position] = edge[2]
+            positions[edge[source]] = position + 1
+
+        return offsets, indices, data_sizes
@@ -0,0 +1,67 @@
+import math
+import os
+from typing import Tuple
+
+from .Fog import Fog
+
+
+class FogIndex:
+    '''
+    Uniform grid over the fog coverage areas. Every cell keeps its candidate fogs, the ones whose coverage disc
+    overlaps it, so a query only runs the distance check on the candidates of the device's cell that do not cover
+    the whole cell.
+    '''
+
+    def __init__(self, fogs: list[Fog]):
+        self.fogs: list[Fog] = fogs
+
+        # the largest coverage area keeps every disc within 3x3 cells
+        cell_size = int(os.environ.get('FOG_INDEX_CELL_SIZE', 0))
+        if cell_size <= 0:
+            cell_size = max([math.ceil(fog.coverage_area) for fog in fogs], default=1)
+        self.cell_size: int = max(cell_size, 1)
+
+        # cell -> [0: fog index, 1: whether the fog covers the whole cell], in fog index order
+        self.cells: dict[Tuple[int, int], list[Tuple[int, bool]]] = {}
+        for i in range(len(fogs)):
+            self.insert(i)
+
+    def insert(self, fog_index: int):
+        fog = self.fogs[fog_index]
+        radius = fog.coverage_area
+        for cx in range(math.floor((fog.position_x - radius) / self.cell_size),
+                        math.floor((fog.position_x + radius) / self.cell_size) + 1):
+            for cy in range(math.floor((fog.position_y - radius) / self.cell_size),
+                            math.floor((fog.position_y + radius) / self.cell_size) + 1):
+                # closest and farthest point of the cell to the fog
+                x0, y0 = cx * self.cell_size, cy * self.cell_size
+                x1, y1 = x0 + self.cell_size, y0 + self.cell_size
+                near_x = min(max(fog.position_x, x0), x1)
+                near_y = min(max(fog.position_y, y0), y1)
+                if not fog.is_in_range(near_x, near_y):
+                    continue
+                far_x = x0 if fog.position_x - x0 > x1 - fog.position_x else x1
+                far_y = y0 if fog.position_y - y0 > y1 - fog.position_y else y1
+                self.cells.setdefault((cx, cy), []).append((fog_index, fog.is_in_range(far_x, far_y)))
+
+    def in_range(self, position_x: int, position_y: int) -> list[int]:
+        '''
+        Indexes of the fogs covering the position, in ascending order.
+        '''
+        cell = (position_x // self.cell_size, position_y // self.cell_size)
+        return [fog_index for fog_index, covers_cell in self.cells.get(cell, [])
+                if covers_cell or self.fogs[fog_index].is_in_range(position_x, position_y)]
+
+    def nearest_in_range(self, position_x: int, position_y: int) -> Fog | None:
+        '''
+        The closest fog covering the position, the first registered one on ties.
+        '''
+        nearest_fog = None
+        nearest_dis = math.inf
+        for fog_index in self.in_range(position_x, position_y):
+            fog = self.fogs[fog_index]
+            dis = fog.distance(position_x, position_y)
+            if dis < nearest_dis:
+                nearest_dis = dis
+                nearest_fog = fog
+        return nearest_fog
@@ -0,0 +1,85 @@
+import math
+
+import numpy as np
+
+from .PositionHistory import PositionHistory
+
+
+class MobilityPredictor:
+    '''
+    Extrapolates the device trajectory from its position history. The device keeps its drift only when the history
+    moved clearly further than its own steps would by chance, otherwise it is expected to stay around its last
+    position, with a spread that grows like a random walk at the rate seen in the history.
+    '''
+
+    def __init__(self, positions: PositionHistory, walk_model: str, speed: float, max_position: tuple[int, int]):
+        self.positions = positions
+        self.walk_model = walk_model
+        self.speed = speed  # steps per ms
+        self.max_position = max_position
+        # how many times the chance displacement the history must move to be extrapolated
+        self.drift_ratio: float = 4
+
+    def predict(self, t: int) -> tuple[tuple[float, float], float] | None:
+        '''
+        Expected position of the device at time t (ms) and the distance from it within which the device is likely to
+        be then, both from one read of the history. None without any position yet.
+        '''
+        samples = self.positions.last_samples(self.positions.capacity)
+        if len(samples[0]) == 0:
+            return None
+
+        return self.predict_position(t, samples), self.predict_spread(t, samples)
+
+    def predict_position(self, t: int,
+                         samples: tuple[np.ndarray, np.ndarray] | None = None) -> tuple[float, float] | None:
+        '''
+        Expected position of the device at time t (ms), from its position history or from the given positions and
+        times read from it. None without any position yet.
+        '''
+        positions, times = samples if samples is not None else self.positions.last_samples(self.positions.capacity)
+        count = len(positions)
+        if count == 0:
+            return None
+
+        last_x, last_y = float(positions[count - 1, 0]), float(positions[count - 1, 1])
+        duration = float(times[count - 1] - times[0])
+        if count < 2 or duration <= 0 or t <= times[count - 1]:
+            return last_x, last_y
+
+        dx = last_x - float(positions[0, 0])
+        dy = last_y - float(positions[0, 1])
+        steps = positions[1:] - positions[:-1]
+        chance_displacement = math.sqrt(float((steps * steps).sum()))
+        if dx * dx + dy * dy <= (self.drift_ratio * chance_displacement) ** 2:
+            return last_x, last_y
+
+        horizon = (t - times[count - 1]) / duration
+        x = min(max(last_x + dx * horizon, 0), self.max_position[0])
+        y = min(max(last_y + dy * horizon, 0), self.max_position[1])
+        return x, y
+
+    def predict_spread(self, t: int, samples: tuple[np.ndarray, np.ndarray] | None = None) -> float | None:
+        '''
+        Distance from the expected position within which the device is likely to be at time t (ms), from its position
+        history or from the given positions and times read from it. None without any position yet.
+        '''
+        positions, times = samples if samples is not None else self.positions.last_samples(self.positions.capacity)
+        count = len(positions)
+        if count == 0:
+            return None
+        if t <= times[count - 1]:
+            return 0
+
+        duration = float(times[count - 1] - times[0])
+        if count >= 2 and duration > 0:
+            steps = positions[1:] - positions[:-1]
+            # mean squared displacement per ms
+            rate = float((steps * steps).sum()) / duration
+        elif self.walk_model == "Random":
+            # each axis moves -1, 0 or 1 per step, a variance of 2/3
+            rate = 2 * 2 / 3 * self.speed
+        else:
+            return math.inf
+
+        return math.sqrt(rate * (t - times[count - 1]))
@@ -0,0 +1,87 @@
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+
+class OffloadDispatcher:
+    '''
+    Sends offloaded tasks from a bounded worker pool over keep-alive sessions, one per destination in every worker
+    since a session is not thread-safe. Tasks headed to the same destination within the batch window are sent
+    together in one pushTasks request.
+    '''
+
+    def __init__(self):
+        self.workers: int = int(os.environ.get('OFFLOAD_WORKERS', 8))
+        self.batch_window: float = float(os.environ.get('OFFLOAD_BATCH_WINDOW', 5))  # ms
+        self.executor = ThreadPoolExecutor(max_workers=self.workers)
+        self.headers = {
+            'Content-Type': 'application/json'
+        }
+
+        # per worker thread: url -> keep-alive session
+        self.local = threading.local()
+        # (url, edge address) -> [0: task, 1: description]
+        self.batches: dict[tuple[str, str], list[tuple[dict, str]]] = {}
+        # (url, edge address) -> time at which its batch is sent
+        self.flush_times: dict[tuple[str, str], float] = {}
+        self.batches_condition = threading.Condition()
+
+        _flush_thread = threading.Thread(target=self.flush, args=(), daemon=True)
+        _flush_thread.start()
+
+    def dispatch(self, url: str, back_address: str, task: dict, description: str):
+        with self.batches_condition:
+            key = (url, back_address)
+            if key not in self.batches:
+                self.batches[key] = []
+                self.flush_times[key] = time.time() + self.batch_window / 1000
+            self.batches[key].append((task, description))
+            self.batches_condition.notify()
+
+    def flush(self):
+        while True:
+            with self.batches_condition:
+                while len(self.flush_times) == 0:
+                    self.batches_condition.wait()
+
+                key = min(self.flush_times, key=self.flush_times.get)
+                remaining_time = self.flush_times[key] - time.time()
+                if remaining_time > 0:
+                    self.batches_condition.wait(remaining_time)
+                    continue
+
+                del self.flush_times[key]
+                batch = self.batches.pop(key)
+
+            self.executor.submit(self.send, key[0], key[1], batch)
+
+    def get_session(self, url: str) -> requests.Session:
+        sessions: dict[str, requests.Session] | None = getattr(self.local, 'sessions', None)
+        if sessions is None:
+            sessions = {}
+            self.local.sessions = sessions
+        if url not in sessions:
+            sessions[url] = requests.Session()
+        return sessions[url]
+
+    def send(self, url: str, back_address: str, batch: list[tuple[dict, str]]):
+        data = {
+            "tasks": [task for task, _ in batch],
+            "edgeAddress": back_address,
+        }
+
+        try:
+            response = self.get_session(url).post(url, data=json.dumps(data), headers=self.headers)
+        except requests.RequestException as e:
+            print(f"Failed to submit data: {e}")
+            return
+
+        if response.status_code == 200:
+            for _, description in batch:
+                print(f"{description} submitted successfully")
+        else:
+            print(f"Failed to submit data: {response.status_code}")
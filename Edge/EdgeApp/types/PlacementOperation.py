@@ -0,0 +1,8 @@
+from enum import Enum
+
+
+class PlacementOperation(Enum):
+    Insert = 0  # new segment of the placed task
+    Extend = 1  # the placed task's segment right before continues
+    Truncate = 2  # a preempted allocation loses its tail
+    Remove = 3  # a preempted allocation is dropped
@@ -0,0 +1,56 @@
+import numpy as np
+
+
+class PositionHistory:
+    '''
+    Fixed-size history of the device positions. Every position is written twice, at its slot and at its slot plus
+    the number of slots, so the last k positions are always one contiguous slice. There is a single writer (the walk
+    thread) and the count is only advanced after the write, so readers take no lock. The ring keeps one slot more
+    than the capacity, so the slot the next append overwrites is never part of a view. A view stays intact through
+    that one append only, so readers use it right away and copy what they keep.
+    '''
+
+    def __init__(self, capacity: int):
+        self.capacity: int = capacity
+        self.slots: int = capacity + 1
+        self.buffer = np.zeros((2 * self.slots, 2), dtype=np.int64)
+        # time (ms) at which each position was reached, mirrored the same way
+        self.times = np.zeros(2 * self.slots, dtype=np.int64)
+        # number of positions written so far
+        self.count: int = 0
+
+    def __len__(self) -> int:
+        return min(self.count, self.capacity)
+
+    def clear(self):
+        self.count = 0
+
+    def append(self, position: tuple[int, int], time: int = 0):
+        index = self.count % self.slots
+        self.buffer[index] = position
+        self.buffer[index + self.slots] = position
+        self.times[index] = time
+        self.times[index + self.slots] = time
+        self.count += 1
+
+    def last(self) -> tuple[int, int]:
+        index = (self.count - 1) % self.slots
+        return int(self.buffer[index, 0]), int(self.buffer[index, 1])
+
+    def last_positions(self, max_count: int) -> np.ndarray:
+        '''
+        View of the last max_count positions, oldest first.
+        '''
+        count = self.count
+        max_count = min(max_count, count, self.capacity)
+        end = (count - 1) % self.slots + 1 + self.slots
+        return self.buffer[end - max_count:end]
+
+    def last_samples(self, max_count: int) -> tuple[np.ndarray, np.ndarray]:
+        '''
+        Views of the last max_count positions and of their times, oldest first, taken at the same count.
+        '''
+        count = self.count
+        max_count = min(max_count, count, self.capacity)
+        end = (count - 1) % self.slots + 1 + self.slots
+        return self.buffer[end - max_count:end], self.times[end - max_count:end]
@@ -1,3 +1,4 @@
+import bisect
 import math
 
 
@@ -11,7 +12,10 @@ class Processor:
         self.idle_power: float = idle_power  # W
 
         # [0: task index, 1: workflow index, 2: job index 3: start time, 4: end time]
+        # live timeline, sorted and non-overlapping
         self.allocations: list[list[int]] = []
+        # allocations that finished before the current time, in the same order
+        self.retired_allocations: list[list[int]] = []
 
     def get_execution_time(self, execution_cost: int) -> int:
         '''
@@ -22,5 +26,34 @@ class Processor:
     def get_execution_cost(self, execution_time) -> int:
         return int(self.frequency * execution_time)
 
+    def find_allocation(self, time: int) -> int:
+        '''
+        Returns the index of the first live allocation that ends after the given time.
+        '''
+        return bisect.bisect_right(self.allocations, time, key=lambda allocation: allocation[4])
+
+    def retire_allocations(self, current_time: int):
+        '''
+        Moves the allocations that ended before the current time out of the live timeline. The last one is kept,
+        since the task executed right before a new segment is needed to merge them.
+        '''
+        count = self.find_allocation(current_time) - 1
+        if count > 0:
+            self.retired_allocations.extend(self.allocations[:count])
+            del self.allocations[:count]
+
+    def insert_allocation(self, index: int, allocation: list[int]):
+        self.allocations.insert(index, allocation)
+
+    def resize_allocation(self, index: int, end_time: int):
+        self.allocations[index][4] = end_time
+
+    def remove_allocation(self, index: int):
+        del self.allocations[index]
+
+    def get_allocations(self) -> list[list[int]]:
+        return self.retired_allocations + self.allocations
+
     def clear(self):
         self.allocations.clear()
+        self.retired_allocations.clear()
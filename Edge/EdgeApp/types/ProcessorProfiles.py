@@ -0,0 +1,43 @@
+from .Processor import Processor
+
+
+def create_processors(processor_type: int) -> list[Processor]:
+    '''
+    Returns the processors of a edge device of the given PROCESSOR_TYPE. Kept out of the device package so the
+    simulator can import it without starting the device.
+    '''
+    if processor_type == 0 or processor_type == 1:
+        processor_cores = 4
+        processor_frequency = 1.5
+        memory = 2 if processor_type == 0 else 4
+        active_power = 8
+        idle_power = 2.7
+    elif processor_type == 2:
+        processor_cores = 4
+        processor_frequency = 1.4
+        memory = 1
+        active_power = 4.5
+        idle_power = 2
+    elif processor_type == 3:
+        processor_cores = 4
+        processor_frequency = 2.83
+        memory = 4
+        active_power = 118
+        idle_power = 56.7
+    elif processor_type == 4:
+        processor_cores = 4
+        processor_frequency = 2.83
+        memory = 2
+        active_power = 95.4
+        idle_power = 49.6
+    else:
+        processor_cores = 4
+        processor_frequency = 2.4
+        memory = 2 if processor_type == 5 else 4
+        active_power = 9
+        idle_power = 2.75
+
+    processors: list[Processor] = []
+    for i in range(processor_cores):
+        processors.append(Processor(i, processor_frequency, memory, active_power, idle_power))
+    return processors
@@ -6,6 +6,7 @@ from rest_framework.response import Response
 
 from .device import DEVICE
 from .dtos.DagSerializer import DagSerializer
+from .dtos.ExecutedTaskSerializer import ExecutedTaskSerializer
 from .dtos.PeriodicTaskSerializer import PeriodicTaskSerializer
 from .serializers import EdgeSerializer
 
@@ -91,3 +92,17 @@ class EdgeView(viewsets.ViewSet):
             return Response({"message": f"Received."})
         else:
             return Response(serializer.errors, status=400)
+
+    @swagger_auto_schema(
+        request_body=EdgeSerializer.NotifyExecuteTasks.NotifyExecuteTasksRequest,
+        responses={200: 'Success', 400: 'Bad request'}
+    )
+    @action(detail=False, methods=['patch'], url_path='tasks/notifyExecuteTasks')
+    def notifyExecuteTasks(self, request):
+        serializer = EdgeSerializer.NotifyExecuteTasks.NotifyExecuteTasksRequest(data=request.data)
+        if serializer.is_valid():
+            tasks: list[ExecutedTaskSerializer] = serializer.validated_data['tasks']
+            DEVICE.notify_execute_tasks([(task['taskId'], task['workflowId'], task['jobId']) for task in tasks])
+            return Response({"message": f"{len(tasks)} received."})
+        else:
+            return Response(serializer.errors, status=400)
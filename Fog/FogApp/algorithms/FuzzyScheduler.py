@@ -1,6 +1,8 @@
+import heapq
+import math
 import time
-from queue import Queue
-from threading import Lock
+from collections import deque
+from threading import Lock, Event
 
 from ..types.Cloud import Cloud
 from ..types.PreemptionType import PreemptionType
@@ -13,51 +15,76 @@ class FuzzyScheduler:
         self.processors = processors
         self.start_time: float = 0
         self.time_scale = time_scale
+        # wall clock in seconds, replaced by a virtual clock in simulation
+        self.clock = time.time
         self.tasks: list[SubTask] = []
         self.preemption_type: PreemptionType = preemption_type
         self.cloud: Cloud = cloud
 
-        self.scheduling_queue = Queue()
-        self.backup_queue = Queue()
+        self.scheduling_queue = deque()
+        self.backup_queue = deque()
         self.queue_lock = Lock()
+        # set on every arrival so an idle scheduling thread wakes up
+        self.wakeup = Event()
+        # [0: end time, 1: task index] of the placed tasks waiting to be notified
+        self.completion_heap: list[tuple[int, int]] = []
 
     def clear(self):
         self.queue_lock.acquire()
         self.tasks.clear()
         for processor in self.processors:
             processor.clear()
-        self.scheduling_queue.queue.clear()
-        self.backup_queue.queue.clear()
+        self.scheduling_queue.clear()
+        self.backup_queue.clear()
+        self.completion_heap.clear()
 
         self.queue_lock.release()
 
     def add_task(self, new_task: SubTask):
+        self.add_tasks([new_task])
+
+    def add_tasks(self, new_tasks: list[SubTask]):
         self.queue_lock.acquire()
-        new_task.index = len(self.tasks)
-        self.tasks.append(new_task)
-        new_task.arrival_time = int((time.time() - self.start_time) * self.time_scale * 1000)
-        new_task.absolute_deadline = int((new_task.absolute_deadline_time - self.start_time) * self.time_scale * 1000)
-        self.scheduling_queue.put(new_task.index)
+        arrival_time = int((self.clock() - self.start_time) * self.time_scale * 1000)
+        for new_task in new_tasks:
+            new_task.index = len(self.tasks)
+            self.tasks.append(new_task)
+            new_task.arrival_time = arrival_time
+            new_task.absolute_deadline = int((new_task.absolute_deadline_time - self.start_time)
+                                             * self.time_scale * 1000)
+            self.scheduling_queue.append(new_task.index)
         self.queue_lock.release()
+        self.wakeup.set()
 
-    def schedule(self, current_time: int, total_time: int):
+    def schedule(self, current_time: int, total_time: int) -> float:
         self.queue_lock.acquire()
-        q_size = self.scheduling_queue.qsize()
+        q_size = len(self.scheduling_queue)
         for i in range(q_size):
-            task_index = self.scheduling_queue.get()
+            task_index = self.scheduling_queue.popleft()
             self.schedule_subtask(current_time, task_index)
 
-        while not self.backup_queue.empty():
-            self.scheduling_queue.put(self.backup_queue.get())
+        self.scheduling_queue.extend(self.backup_queue)
+        self.backup_queue.clear()
+
+        while len(self.completion_heap) > 0 and self.completion_heap[0][0] <= current_time:
+            end_time, task_index = heapq.heappop(self.completion_heap)
+            task = self.tasks[task_index]
+            task.edge.notify(task.id, task.workflow_id, task.job_id)
+            task.is_notify = True
 
-        for task in self.tasks:
-            if ((not task.is_notify) and task.remaining_execution_cost == 0
-                    and task.execution_times[-1][2] <= current_time):
-                task.edge.notify(task.id, task.workflow_id, task.job_id)
-                task.is_notify = True
+        next_event_time = math.inf
+        if self.scheduling_queue:
+            # the waiting tasks need a processor to become idle
+            for p in self.processors:
+                if len(p.allocations) > 0:
+                    next_event_time = min(next_event_time, p.allocations[-1][2])
+        if len(self.completion_heap) > 0:
+            next_event_time = min(next_event_time, self.completion_heap[0][0])
 
         self.queue_lock.release()
 
+        return next_event_time
+
 
     def schedule_subtask(self, start_time: int, task_index: int):
         candidate_processor: Processor | None = None
@@ -75,7 +102,7 @@ class FuzzyScheduler:
             self.offload(0, task)
         else:
             if candidate_processor is None:
-                self.backup_queue.put(task_index)
+                self.backup_queue.append(task_index)
                 return
 
             new_idle = self.check_processor(candidate_processor, start_time, task_index, False)
@@ -98,6 +125,7 @@ class FuzzyScheduler:
             task.remaining_execution_cost = 0
             task.execution_times = [[p.index, start_time, end_time]]
             p.allocations.append([task_index, start_time, end_time])
+            heapq.heappush(self.completion_heap, (end_time, task_index))
 
         return True
 
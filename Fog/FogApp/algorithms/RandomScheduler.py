@@ -1,6 +1,8 @@
+import heapq
+import math
 import random
 import time
-from threading import Lock
+from threading import Lock, Event
 
 from ..types.Cloud import Cloud
 from ..types.PreemptionType import PreemptionType
@@ -13,9 +15,15 @@ class RandomScheduler:
         self.processors = processors
         self.start_time: float = 0
         self.time_scale = time_scale
+        # wall clock in seconds, replaced by a virtual clock in simulation
+        self.clock = time.time
         self.tasks: list[SubTask] = []
         self.ready_tasks_lock = Lock()
+        # set on every arrival so an idle scheduling thread wakes up
+        self.wakeup = Event()
         self.ready_tasks: list[int] = []
+        # [0: end time, 1: task index] of the placed tasks waiting to be notified
+        self.completion_heap: list[tuple[int, int]] = []
         self.preemption_type: PreemptionType = preemption_type
         self.cloud: Cloud = cloud
 
@@ -25,19 +33,27 @@ class RandomScheduler:
         for processor in self.processors:
             processor.clear()
         self.ready_tasks.clear()
+        self.completion_heap.clear()
 
         self.ready_tasks_lock.release()
 
     def add_task(self, new_task: SubTask):
+        self.add_tasks([new_task])
+
+    def add_tasks(self, new_tasks: list[SubTask]):
         self.ready_tasks_lock.acquire()
-        new_task.index = len(self.tasks)
-        self.tasks.append(new_task)
-        new_task.arrival_time = int((time.time() - self.start_time) * self.time_scale * 1000)
-        new_task.absolute_deadline = int((new_task.absolute_deadline_time - self.start_time) * self.time_scale * 1000)
-        self.ready_tasks.append(new_task.index)
+        arrival_time = int((self.clock() - self.start_time) * self.time_scale * 1000)
+        for new_task in new_tasks:
+            new_task.index = len(self.tasks)
+            self.tasks.append(new_task)
+            new_task.arrival_time = arrival_time
+            new_task.absolute_deadline = int((new_task.absolute_deadline_time - self.start_time)
+                                             * self.time_scale * 1000)
+            self.ready_tasks.append(new_task.index)
         self.ready_tasks_lock.release()
+        self.wakeup.set()
 
-    def schedule(self, current_time: int, total_time: int):
+    def schedule(self, current_time: int, total_time: int) -> float:
         self.ready_tasks_lock.acquire()
 
         max_checked = 100
@@ -55,16 +71,27 @@ class RandomScheduler:
                 continue
 
             self.schedule_subtask(current_time, selected_ready_task)
-            del self.ready_tasks[selected_index]
-
-        for task in self.tasks:
-            if ((not task.is_notify) and task.remaining_execution_cost == 0
-                    and task.execution_times[-1][2] <= current_time):
-                task.edge.notify(task.id, task.workflow_id, task.job_id)
-                task.is_notify = True
+            # the order of the ready tasks does not matter, so fill the gap with the last one
+            self.ready_tasks[selected_index] = self.ready_tasks[-1]
+            self.ready_tasks.pop()
+
+        while len(self.completion_heap) > 0 and self.completion_heap[0][0] <= current_time:
+            end_time, task_index = heapq.heappop(self.completion_heap)
+            task = self.tasks[task_index]
+            task.edge.notify(task.id, task.workflow_id, task.job_id)
+            task.is_notify = True
+
+        next_event_time = math.inf
+        if len(self.ready_tasks) > 0:
+            # tasks left over by the check limit are picked up in the next round
+            next_event_time = current_time
+        if len(self.completion_heap) > 0:
+            next_event_time = min(next_event_time, self.completion_heap[0][0])
 
         self.ready_tasks_lock.release()
 
+        return next_event_time
+
     def schedule_subtask(self, start_time: int, task_index: int):
         task: SubTask = self.tasks[task_index]
 
@@ -80,6 +107,7 @@ class RandomScheduler:
             task.remaining_execution_cost = 0
             task.execution_times = [[processor_index, start_time, end_time]]
             self.processors[processor_index].allocations.append([task_index, start_time, end_time])
+            heapq.heappush(self.completion_heap, (end_time, task_index))
 
     def offload(self, offload_index: int, task: SubTask):
         self.cloud.offload(task.edge.address, task)
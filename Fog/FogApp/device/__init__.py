@@ -12,8 +12,10 @@ from ..algorithms.Scheduler import Scheduler
 from ..dtos.SubTaskSerializer import SubTaskSerializer
 from ..types.Cloud import Cloud
 from ..types.Edge import Edge
+from ..types.NotificationBatcher import NotificationBatcher
 from ..types.PreemptionType import PreemptionType
 from ..types.Processor import Processor
+from ..types.ProcessorProfiles import create_processors
 from ..types.SubTask import SubTask
 
 
@@ -45,36 +47,10 @@ class _Device:
 
         # init processor characteristics
         processor_type = int(os.environ.get('PROCESSOR_TYPE', 0))
-        if processor_type == 0:
-            processor_cores = 18
-            processor_frequency = 2.1
-            memory = 8
-            active_power = 557
-            idle_power = 86.3
-        elif processor_type == 1:
-            processor_cores = 6
-            processor_frequency = 3.06
-            memory = 4
-            active_power = 227
-            idle_power = 62.2
-        elif processor_type == 2:
-            processor_cores = 8
-            processor_frequency = 3.2
-            memory = 8
-            active_power = 62.5
-            idle_power = 17.6
-        else:
-            processor_cores = 8
-            processor_frequency = 3.2
-            memory = 16
-            active_power = 98.2
-            idle_power = 22.6
-
-        self.processors: list[Processor] = []
-        for i in range(processor_cores):
-            self.processors.append(Processor(i, processor_frequency, memory, active_power, idle_power))
+        self.processors: list[Processor] = create_processors(processor_type)
 
         self.cloud = Cloud(self.cloud_address)
+        self.notification_batcher = NotificationBatcher()
         self.cloud.register(self.address, self.position_x, self.position_y, self.coverage_area)
         self.scheduler = None
 
@@ -100,12 +76,17 @@ class _Device:
         _thread.start()
 
     def add_task(self, edge_address: str, new_task: SubTaskSerializer):
-        edge = Edge(edge_address)
+        self.add_tasks(edge_address, [new_task])
 
-        task = SubTask(edge, new_task['id'], new_task['workflowId'], new_task['jobId'], new_task['type'],
-                       new_task['executionCost'],
-                       new_task['memory'], new_task['absoluteDeadline'])
-        self.scheduler.add_task(task)
+    def add_tasks(self, edge_address: str, new_tasks: list[SubTaskSerializer]):
+        edge = Edge(edge_address, self.notification_batcher)
+
+        tasks: list[SubTask] = []
+        for new_task in new_tasks:
+            tasks.append(SubTask(edge, new_task['id'], new_task['workflowId'], new_task['jobId'], new_task['type'],
+                                 new_task['executionCost'],
+                                 new_task['memory'], new_task['absoluteDeadline']))
+        self.scheduler.add_tasks(tasks)
 
 
     def run(self):
@@ -117,10 +98,13 @@ class _Device:
         max_scheduling_round_time = 0.0
 
         while DEVICE.status == DeviceStatus.RUNNING:
+            # cleared before scheduling so arrivals during the round are not missed
+            self.scheduler.wakeup.clear()
+
             f = time.time()
 
-            current_time = int((time.time() - self.start_time) * 1000 * self.time_scale)
-            self.scheduler.schedule(current_time, self.total_time)
+            current_time = int((f - self.start_time) * 1000 * self.time_scale)
+            next_event_time = self.scheduler.schedule(current_time, self.total_time)
 
             e = time.time()
             if e - f > max_scheduling_round_time:
@@ -129,6 +113,11 @@ class _Device:
             if current_time > self.total_time:
                 DEVICE.status = DeviceStatus.STOPPED
                 self.result()
+                break
+
+            # sleep until a processor frees up, a placed task completes, a new arrival or the end of the run
+            next_event_time = min(next_event_time, self.total_time + 1)
+            self.scheduler.wakeup.wait(max(next_event_time - current_time, 0) / (1000 * self.time_scale))
 
         print("Max Scheduling Round Time: ", max_scheduling_round_time * 1000)
 
@@ -191,5 +180,12 @@ class _Device:
             energy = p.active_power * total_active + p.idle_power * (self.total_time - total_active)
             print(f"Energy {p.index}: {energy}")
 
+        if isinstance(self.scheduler, Scheduler):
+            print(f"Episodes per Round: min {self.scheduler.round_episodes_min} "
+                  f"| mean {self.scheduler.round_episodes_stats.mean:.2f} "
+                  f"| max {self.scheduler.round_episodes_max}")
+            self.scheduler.save_snapshot()
+            self.scheduler.shutdown()
+
 
 DEVICE = _Device()
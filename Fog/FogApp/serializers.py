@@ -13,3 +13,8 @@ class FogSerializer:
         class PushTaskRequest(serializers.Serializer):
             edgeAddress = serializers.CharField()
             task = SubTaskSerializer()
+
+    class PushTasks:
+        class PushTasksRequest(serializers.Serializer):
+            edgeAddress = serializers.CharField()
+            tasks = serializers.ListField(child=SubTaskSerializer())
@@ -43,7 +43,7 @@ class Cloud:
                 "type": task.task_type.name,
                 "executionCost": task.execution_cost,
                 "memory": task.memory,
-                "absoluteDeadline": task.absolute_deadline
+                "absoluteDeadline": task.absolute_deadline_time
             },
             "edgeAddress": back_address,
         }
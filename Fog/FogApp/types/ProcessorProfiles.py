@@ -0,0 +1,37 @@
+from .Processor import Processor
+
+
+def create_processors(processor_type: int) -> list[Processor]:
+    '''
+    Returns the processors of a fog device of the given PROCESSOR_TYPE. Kept out of the device package so the
+    simulator can import it without starting the device.
+    '''
+    if processor_type == 0:
+        processor_cores = 18
+        processor_frequency = 2.1
+        memory = 8
+        active_power = 557
+        idle_power = 86.3
+    elif processor_type == 1:
+        processor_cores = 6
+        processor_frequency = 3.06
+        memory = 4
+        active_power = 227
+        idle_power = 62.2
+    elif processor_type == 2:
+        processor_cores = 8
+        processor_frequency = 3.2
+        memory = 8
+        active_power = 62.5
+        idle_power = 17.6
+    else:
+        processor_cores = 8
+        processor_frequency = 3.2
+        memory = 16
+        active_power = 98.2
+        idle_power = 22.6
+
+    processors: list[Processor] = []
+    for i in range(processor_cores):
+        processors.append(Processor(i, processor_frequency, memory, active_power, idle_power))
+    return processors
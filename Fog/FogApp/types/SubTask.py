@@ -28,17 +28,6 @@ class SubTask:
 
         # 0: processor index, 1: start time, 2: end time
         self.execution_times: list[list[int]] = []
-        self.temp_execution_times: list[list[int]] = []
-        self.temp_remaining_execution_cost = execution_cost
-        self.temp_offload_index: int | None = None
+        self.offload_index: int | None = None
 
         self.is_notify = False
-
-    def clear_cache(self):
-        self.temp_execution_times = [item for item in self.execution_times]
-        self.temp_remaining_execution_cost = self.remaining_execution_cost
-        self.temp_offload_index = None
-
-    def apply_cache(self):
-        self.execution_times = [item for item in self.temp_execution_times]
-        self.remaining_execution_cost = self.temp_remaining_execution_cost
@@ -46,3 +46,18 @@ class FogView(viewsets.ViewSet):
             return Response({"message": f"task added."})
         else:
             return Response(serializer.errors, status=400)
+
+    @swagger_auto_schema(
+        request_body=FogSerializer.PushTasks.PushTasksRequest,
+        responses={200: 'Success', 400: 'Bad request'}
+    )
+    @action(detail=False, methods=['post'], url_path='tasks/pushTasks')
+    def pushTasks(self, request):
+        serializer = FogSerializer.PushTasks.PushTasksRequest(data=request.data)
+        if serializer.is_valid():
+            edge_address: str = serializer.validated_data['edgeAddress']
+            tasks: list[SubTaskSerializer] = serializer.validated_data['tasks']
+            DEVICE.add_tasks(edge_address, tasks)
+            return Response({"message": f"{len(tasks)} tasks added."})
+        else:
+            return Response(serializer.errors, status=400)
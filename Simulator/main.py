@@ -0,0 +1,45 @@
+import json
+import os
+import time
+
+from Simulator.src import ROOT
+from Simulator.src.LatencyModel import ConstantLatency, LatencyModel, TierLatency
+from Simulator.src.Simulation import Simulation
+
+if __name__ == '__main__':
+    algorithms = os.environ.get('ALGORITHMS', 'MEES').split(',')  # MEES | Random | HEFT_EDF | Fuzzy
+    tasks_loads = os.environ.get('TASKS_LOADS', 'load-4,load-3,load-2').split(',')
+    tasks_dominance = os.environ.get('TASKS_DOMINANCE', 'hard,soft,firm').split(',')
+    tasks_path = os.environ.get('TASKS_PATH', os.path.join(ROOT, 'Wrapper', 'tasks'))
+    results_path = os.environ.get('RESULTS_PATH', os.path.join(ROOT, 'Results', 'Simulation'))
+
+    fog_count = int(os.environ.get('FOG_COUNT', 20))
+    edge_count = int(os.environ.get('EDGE_COUNT', 90))
+    total_time = int(os.environ.get('TOTAL_TIME', 510_000))
+    scheduler_total_time = int(os.environ.get('SCHEDULER_TOTAL_TIME', 500_000))
+    seed = int(os.environ.get('SEED', 0))
+
+    latency_model_name = os.environ.get('LATENCY_MODEL', 'None')  # None | Constant | Tier
+    if latency_model_name == "Constant":
+        latency_model = ConstantLatency(int(os.environ.get('LATENCY', 5)))
+    elif latency_model_name == "Tier":
+        latency_model = TierLatency(int(os.environ.get('EDGE_FOG_LATENCY', 2)),
+                                    int(os.environ.get('EDGE_CLOUD_LATENCY', 20)),
+                                    int(os.environ.get('FOG_CLOUD_LATENCY', 15)))
+    else:
+        latency_model = LatencyModel()
+
+    for load in tasks_loads:
+        for dominance in tasks_dominance:
+            for algorithm in algorithms:
+                with open(f'{tasks_path}/{load}/{dominance}/dags.json', 'r') as file:
+                    dags = json.load(file)
+                with open(f'{tasks_path}/{load}/{dominance}/periodic_tasks.json', 'r') as file:
+                    periodic_tasks = json.load(file)
+
+                start = time.time()
+                simulation = Simulation(algorithm, fog_count, edge_count, total_time, scheduler_total_time, seed,
+                                        latency_model)
+                events = simulation.run(dags, periodic_tasks)
+                simulation.result(results_path, f"{load}-{dominance}")
+                print(f"{algorithm} {load}-{dominance}: {events} events in {time.time() - start:.2f} s")
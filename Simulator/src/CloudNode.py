@@ -0,0 +1,122 @@
+import json
+import os
+
+from CloudApp.algorithms.FuzzyScheduler import FuzzyScheduler
+from CloudApp.algorithms.HEScheduler import HEScheduler
+from CloudApp.algorithms.RandomScheduler import RandomScheduler
+from CloudApp.algorithms.Scheduler import Scheduler, device_snapshot_path
+from CloudApp.types.Edge import Edge
+from CloudApp.types.PreemptionType import PreemptionType
+from CloudApp.types.Processor import Processor
+from CloudApp.types.SubTask import SubTask
+from Simulator.src.EventQueue import EventQueue
+from Simulator.src.Links import NotificationLink
+from Simulator.src.Node import Node
+from Simulator.src.VirtualClock import VirtualClock
+
+
+class CloudNode(Node):
+    '''
+    The cloud device on the virtual clock.
+    '''
+
+    def __init__(self, address: str, algorithm: str, clock: VirtualClock, events: EventQueue,
+                 notification_link: NotificationLink, total_time: int):
+        super().__init__(address, clock, events, total_time)
+        self.tier = 'Cloud'
+        self.algorithm = algorithm
+        self.notification_link = notification_link
+        self.preemption_type = PreemptionType[os.environ.get('PREEMPTION_TYPE', 'Lazy')]
+        self.edges: dict[str, Edge] = {}
+
+        # init processor characteristics
+        processor_cores = int(os.environ.get('PROCESSOR_CORES', 4))
+        processor_frequency = float(os.environ.get('PROCESSOR_FREQUENCY', 1.86))
+        memory = int(os.environ.get('MEMORY', 4))
+        active_power = float(os.environ.get('ACTIVE_POWER', 387))
+        idle_power = float(os.environ.get('IDLE_POWER', 271))
+        self.processors: list[Processor] = []
+        for i in range(processor_cores):
+            self.processors.append(Processor(i, processor_frequency, memory, active_power, idle_power))
+
+        if algorithm == "MEES":
+            self.scheduler = Scheduler(self.processors, 1, self.preemption_type)
+        elif algorithm == "HEFT_EDF":
+            self.scheduler = HEScheduler(self.processors, 1, self.preemption_type)
+        elif algorithm == "Random":
+            self.scheduler = RandomScheduler(self.processors, 1, self.preemption_type)
+        else:
+            self.scheduler = FuzzyScheduler(self.processors, 1, self.preemption_type)
+        if isinstance(self.scheduler, Scheduler):
+            # every node of the simulation keeps its own snapshot
+            self.scheduler.snapshot_path = device_snapshot_path(address)
+        self.scheduler.clock = clock.time
+        self.scheduler.start_time = 0
+        self.scheduler.clear()
+
+    def start(self):
+        self.wake(self.clock.now)
+
+    def schedule(self, current_time: int) -> float:
+        return self.scheduler.schedule(current_time, self.total_time)
+
+    def push_tasks(self, edge_address: str, new_tasks: list[dict]):
+        if edge_address not in self.edges:
+            self.edges[edge_address] = Edge({'address': edge_address}, self.notification_link)
+        edge = self.edges[edge_address]
+
+        tasks: list[SubTask] = []
+        for new_task in new_tasks:
+            tasks.append(SubTask(edge, new_task['id'], new_task['workflowId'], new_task['jobId'], new_task['type'],
+                                 new_task['executionCost'], new_task['memory'], new_task['absoluteDeadline']))
+        self.scheduler.add_tasks(tasks)
+        self.wake(self.clock.now)
+
+    def result(self, results_path: str, output_name: str):
+        tasks_json = []
+        for task in self.scheduler.tasks:
+            tasks_json.append({
+                'edge': task.edge.address,
+                'index': task.index,
+                'id': task.id,
+                'workflowId': task.workflow_id,
+                'jobId': task.job_id,
+                'type': task.task_type.name,
+                'executionCost': task.execution_cost,
+                'memory': task.memory,
+                'executionTimes': task.execution_times,
+                'arrivalTime': task.arrival_time,
+                'deadline': task.absolute_deadline,
+            })
+
+        with open(f'{results_path}/tasks-{self.algorithm}-{output_name}.json', "w") as file:
+            file.write(json.dumps(tasks_json))
+
+        processors_json = []
+        for processor in self.processors:
+            allocations_json = []
+            for allocation in processor.allocations:
+                task = self.scheduler.tasks[allocation[0]]
+                allocations_json.append({
+                    'index': task.index,
+                    'startTime': allocation[1],
+                    'endTime': allocation[2],
+                    'taskId': task.id,
+                    'workflowId': task.workflow_id,
+                    'jobId': task.job_id,
+                })
+
+            processors_json.append({
+                'frequency': processor.frequency,
+                'activePower': processor.active_power,
+                'idlePower': processor.idle_power,
+                'memory': processor.memory,
+                'allocations': allocations_json
+            })
+
+        with open(f'{results_path}/processors-{self.algorithm}-{output_name}.json', "w") as file:
+            file.write(json.dumps(processors_json))
+
+        if isinstance(self.scheduler, Scheduler):
+            self.scheduler.save_snapshot()
+            self.scheduler.shutdown()
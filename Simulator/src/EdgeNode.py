@@ -0,0 +1,155 @@
+import json
+import os
+import random
+
+from EdgeApp.algorithms.FuzzyScheduler import FuzzyScheduler
+from EdgeApp.algorithms.HEScheduler import HEScheduler
+from EdgeApp.algorithms.RandomScheduler import RandomScheduler
+from EdgeApp.algorithms.Scheduler import Scheduler
+from EdgeApp.types.DAG import DAG
+from EdgeApp.types.MobilityPredictor import MobilityPredictor
+from EdgeApp.types.PeriodicTask import PeriodicTask
+from EdgeApp.types.PositionHistory import PositionHistory
+from EdgeApp.types.PreemptionType import PreemptionType
+from EdgeApp.types.Processor import Processor
+from EdgeApp.types.ProcessorProfiles import create_processors
+from Simulator.src import load_module
+from Simulator.src.EventQueue import EventQueue
+from Simulator.src.Links import EdgeCloudLink
+from Simulator.src.Node import Node
+from Simulator.src.VirtualClock import VirtualClock
+
+# EdgeApp.device starts the live device when imported, so the walk models are loaded from their own file
+mobility = load_module('mobility', 'Edge/EdgeApp/device/mobility.py')
+
+
+class EdgeNode(Node):
+    '''
+    An edge device on the virtual clock. The walk is caught up at every round instead of every ms, with at most
+    walk_samples positions recorded per round.
+    '''
+
+    def __init__(self, address: str, processor_type: int, algorithm: str, clock: VirtualClock, events: EventQueue,
+                 cloud: EdgeCloudLink, total_time: int, scheduler_total_time: int):
+        super().__init__(address, clock, events, total_time)
+        self.tier = 'Edge'
+        self.algorithm = algorithm
+        self.scheduler_total_time = scheduler_total_time
+        self.walk_model: str = os.environ.get('WALK_MODE', mobility.WalkMode.Random.value)
+        self.speed: float = float(os.environ.get('SPEED', 1.0))
+        self.walk_samples: int = int(os.environ.get('WALK_SAMPLES', 10))
+        self.preemption_type = PreemptionType[os.environ.get('PREEMPTION_TYPE', 'Lazy')]
+
+        # init device position characteristics
+        position_x_max = int(os.environ.get('POSITION_X_MAX', 1000))
+        position_y_max = int(os.environ.get('POSITION_Y_MAX', 1000))
+        self.max_position = (position_x_max, position_y_max)
+        self.start_position = (random.randint(0, position_x_max), random.randint(0, position_y_max))
+        self.positions = PositionHistory(int(os.environ.get('POSITION_HISTORY_SIZE', 100)))
+        self.positions.append(self.start_position)
+        self.walker = mobility.Walker(self.walk_model, self.start_position, self.max_position,
+                                      int(os.environ.get('WALK_BLOCK_SIZE', 4096)))
+        self.walk_time = 0
+        self.remaining_steps: float = 0
+
+        # init processor characteristics
+        self.bus_bandwidth = int(os.environ.get('BUS_BANDWIDTH', 100))
+        self.processors: list[Processor] = create_processors(processor_type)
+
+        if algorithm == "MEES":
+            self.scheduler = Scheduler(self.processors, self.bus_bandwidth, 1, self.preemption_type, address, cloud)
+            self.scheduler.mobility_predictor = MobilityPredictor(self.positions, self.walk_model, self.speed,
+                                                                  self.max_position)
+        elif algorithm == "HEFT_EDF":
+            self.scheduler = HEScheduler(self.processors, self.bus_bandwidth, 1, self.preemption_type, address, cloud)
+        elif algorithm == "Random":
+            self.scheduler = RandomScheduler(self.processors, self.bus_bandwidth, 1, self.preemption_type, address,
+                                             cloud)
+        else:
+            self.scheduler = FuzzyScheduler(self.processors, self.bus_bandwidth, 1, self.preemption_type, address,
+                                            cloud)
+        self.scheduler.clock = clock.time
+        self.scheduler.start_time = 0
+        self.scheduler.clear()
+
+    def start(self):
+        self.scheduler.update_network()
+        self.wake(self.clock.now)
+
+    def walk(self, t: int):
+        elapsed = t - self.walk_time
+        samples = min(elapsed, self.walk_samples)
+        for i in range(samples):
+            sample_time = self.walk_time + (elapsed * (i + 1)) // samples
+            self.remaining_steps += self.speed * (sample_time - self.walk_time)
+            steps = int(self.remaining_steps)
+            self.remaining_steps -= steps
+            self.positions.append(self.walker.advance(steps), sample_time)
+            self.walk_time = sample_time
+
+    def schedule(self, current_time: int) -> float:
+        self.walk(current_time)
+        self.scheduler.update_position(self.positions.last())
+        return self.scheduler.schedule(current_time, self.scheduler_total_time)
+
+    def push_dags(self, dags: list[dict]):
+        self.scheduler.add_dags([DAG(dag) for dag in dags])
+        self.wake(self.clock.now)
+
+    def push_periodic_tasks(self, tasks: list[dict]):
+        periodic_tasks: list[PeriodicTask] = []
+        for dto in tasks:
+            periodic_tasks.append(PeriodicTask(dto['id'], 0, dto['type'], dto['executionCost'], dto['memory'],
+                                               dto['deadline']))
+        self.scheduler.add_periodic_tasks(periodic_tasks)
+        self.wake(self.clock.now)
+
+    def notify_execute_tasks(self, tasks: list[tuple[int, int, int]]):
+        self.scheduler.notify_execute_tasks(self.clock.now, tasks)
+        self.wake(self.clock.now)
+
+    def result(self, results_path: str, output_name: str):
+        tasks_json = []
+        for task in [task for dag in self.scheduler.dags for task in dag.subtasks] + self.scheduler.periodic_tasks:
+            tasks_json.append({
+                'id': task.id,
+                'workflowId': task.workflow_id,
+                'jobId': task.job_id,
+                'type': task.task_type.name,
+                'executionCost': task.execution_cost,
+                'memory': task.memory,
+                'executionTimes': task.execution_times,
+                'arrivalTime': task.arrival_time,
+                'deadline': task.deadline,
+                'latency': task.latency,
+                'offloadTime': int(task.offload_time * 1000) if task.offload_time is not None else None,
+                'remainingExecutionCost': task.remaining_execution_cost,
+            })
+
+        with open(f'{results_path}/tasks-{self.algorithm}-{output_name}.json', "w") as file:
+            file.write(json.dumps(tasks_json))
+
+        processors_json = []
+        for processor in self.processors:
+            allocations_json = []
+            for allocation in processor.get_allocations():
+                task = self.scheduler.periodic_tasks[allocation[0]] if allocation[1] == -1 else \
+                    self.scheduler.dags[allocation[1]].subtasks[allocation[0]]
+                allocations_json.append({
+                    'startTime': allocation[3],
+                    'endTime': allocation[4],
+                    'taskId': task.id,
+                    'workflowId': task.workflow_id,
+                    'jobId': task.job_id,
+                })
+
+            processors_json.append({
+                'frequency': processor.frequency,
+                'activePower': processor.active_power,
+                'idlePower': processor.idle_power,
+                'memory': processor.memory,
+                'allocations': allocations_json
+            })
+
+        with open(f'{results_path}/processors-{self.algorithm}-{output_name}.json', "w") as file:
+            file.write(json.dumps(processors_json))
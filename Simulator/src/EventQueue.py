@@ -0,0 +1,25 @@
+import heapq
+from typing import Callable
+
+
+class EventQueue:
+    '''
+    Pending events ordered by time. Events at the same time run in the order they were pushed, which keeps a run
+    reproducible.
+    '''
+
+    def __init__(self):
+        # [0: time, 1: push order, 2: callback, 3: arguments]
+        self.events: list[tuple[int, int, Callable, tuple]] = []
+        self.count: int = 0
+
+    def __len__(self) -> int:
+        return len(self.events)
+
+    def push(self, time: int, callback: Callable, *args):
+        heapq.heappush(self.events, (time, self.count, callback, args))
+        self.count += 1
+
+    def pop(self) -> tuple[int, Callable, tuple]:
+        time, _, callback, args = heapq.heappop(self.events)
+        return time, callback, args
@@ -0,0 +1,129 @@
+import json
+import os
+import random
+
+from FogApp.algorithms.FuzzyScheduler import FuzzyScheduler
+from FogApp.algorithms.HEScheduler import HEScheduler
+from FogApp.algorithms.RandomScheduler import RandomScheduler
+from FogApp.algorithms.Scheduler import Scheduler, device_snapshot_path
+from FogApp.types.Edge import Edge
+from FogApp.types.PreemptionType import PreemptionType
+from FogApp.types.Processor import Processor
+from FogApp.types.ProcessorProfiles import create_processors
+from FogApp.types.SubTask import SubTask
+from Simulator.src.EventQueue import EventQueue
+from Simulator.src.Links import FogCloudLink, NotificationLink
+from Simulator.src.Node import Node
+from Simulator.src.VirtualClock import VirtualClock
+
+
+class FogNode(Node):
+    '''
+    A fog device on the virtual clock.
+    '''
+
+    def __init__(self, address: str, processor_type: int, algorithm: str, clock: VirtualClock, events: EventQueue,
+                 cloud: FogCloudLink, notification_link: NotificationLink, total_time: int):
+        super().__init__(address, clock, events, total_time)
+        self.tier = 'Fog'
+        self.algorithm = algorithm
+        self.notification_link = notification_link
+        self.preemption_type = PreemptionType[os.environ.get('PREEMPTION_TYPE', 'Lazy')]
+
+        # init device position characteristics
+        position_x_max = int(os.environ.get('POSITION_X_MAX', 1000))
+        position_y_max = int(os.environ.get('POSITION_Y_MAX', 1000))
+        self.position_x = random.randint(0, position_x_max)
+        self.position_y = random.randint(0, position_y_max)
+        self.coverage_area = int(os.environ.get('COVERAGE_AREA', 100))
+
+        # init processor characteristics
+        self.processors: list[Processor] = create_processors(processor_type)
+
+        if algorithm == "MEES":
+            self.scheduler = Scheduler(self.processors, 1, self.preemption_type, cloud)
+        elif algorithm == "HEFT_EDF":
+            self.scheduler = HEScheduler(self.processors, 1, self.preemption_type, cloud)
+        elif algorithm == "Random":
+            self.scheduler = RandomScheduler(self.processors, 1, self.preemption_type, cloud)
+        else:
+            self.scheduler = FuzzyScheduler(self.processors, 1, self.preemption_type, cloud)
+        if isinstance(self.scheduler, Scheduler):
+            # every node of the simulation keeps its own snapshot
+            self.scheduler.snapshot_path = device_snapshot_path(address)
+        self.scheduler.clock = clock.time
+        self.scheduler.start_time = 0
+        self.scheduler.clear()
+
+    def dto(self) -> dict:
+        return {
+            'address': self.address,
+            'positionX': self.position_x,
+            'positionY': self.position_y,
+            'coverageArea': self.coverage_area,
+        }
+
+    def start(self):
+        self.wake(self.clock.now)
+
+    def schedule(self, current_time: int) -> float:
+        return self.scheduler.schedule(current_time, self.total_time)
+
+    def push_tasks(self, edge_address: str, new_tasks: list[dict]):
+        edge = Edge(edge_address, self.notification_link)
+
+        tasks: list[SubTask] = []
+        for new_task in new_tasks:
+            tasks.append(SubTask(edge, new_task['id'], new_task['workflowId'], new_task['jobId'], new_task['type'],
+                                 new_task['executionCost'], new_task['memory'], new_task['absoluteDeadline']))
+        self.scheduler.add_tasks(tasks)
+        self.wake(self.clock.now)
+
+    def result(self, results_path: str, output_name: str):
+        tasks_json = []
+        for task in self.scheduler.tasks:
+            tasks_json.append({
+                'edge': task.edge.address,
+                'index': task.index,
+                'id': task.id,
+                'workflowId': task.workflow_id,
+                'jobId': task.job_id,
+                'type': task.task_type.name,
+                'executionCost': task.execution_cost,
+                'memory': task.memory,
+                'executionTimes': task.execution_times,
+                'arrivalTime': task.arrival_time,
+                'deadline': task.absolute_deadline,
+            })
+
+        with open(f'{results_path}/tasks-{self.algorithm}-{output_name}.json', "w") as file:
+            file.write(json.dumps(tasks_json))
+
+        processors_json = []
+        for processor in self.processors:
+            allocations_json = []
+            for allocation in processor.allocations:
+                task = self.scheduler.tasks[allocation[0]]
+                allocations_json.append({
+                    'index': task.index,
+                    'startTime': allocation[1],
+                    'endTime': allocation[2],
+                    'taskId': task.id,
+                    'workflowId': task.workflow_id,
+                    'jobId': task.job_id,
+                })
+
+            processors_json.append({
+                'frequency': processor.frequency,
+                'activePower': processor.active_power,
+                'idlePower': processor.idle_power,
+                'memory': processor.memory,
+                'allocations': allocations_json
+            })
+
+        with open(f'{results_path}/processors-{self.algorithm}-{output_name}.json', "w") as file:
+            file.write(json.dumps(processors_json))
+
+        if isinstance(self.scheduler, Scheduler):
+            self.scheduler.save_snapshot()
+            self.scheduler.shutdown()
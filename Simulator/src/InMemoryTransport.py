@@ -0,0 +1,28 @@
+from Simulator.src.EventQueue import EventQueue
+from Simulator.src.LatencyModel import LatencyModel
+from Simulator.src.Transport import Transport
+from Simulator.src.VirtualClock import VirtualClock
+
+
+class InMemoryTransport(Transport):
+    '''
+    Delivers the messages through the event queue, after the delay the latency model gives for the two nodes. The
+    arguments are handed over as they are, without serialization.
+    '''
+
+    def __init__(self, clock: VirtualClock, events: EventQueue, latency_model: LatencyModel):
+        self.clock = clock
+        self.events = events
+        self.latency_model = latency_model
+        self.nodes: dict[str, object] = {}
+
+    def register(self, address: str, node: object):
+        self.nodes[address] = node
+
+    def send(self, source: str | None, address: str, method: str, *args):
+        node = self.nodes.get(address)
+        if node is None:
+            print(f"Failed to submit data: no node at {address}")
+            return
+        delay = self.latency_model.delay(self.nodes.get(source) if source is not None else None, node)
+        self.events.push(self.clock.now + delay, getattr(node, method), *args)
@@ -0,0 +1,41 @@
+class LatencyModel:
+    '''
+    Delay (ms) of a message between two nodes, None for the harness. The base model delivers every message at once.
+    '''
+
+    def delay(self, source: object | None, destination: object) -> int:
+        return 0
+
+
+class ConstantLatency(LatencyModel):
+    '''
+    The same delay for every message between two nodes.
+    '''
+
+    def __init__(self, latency: int):
+        self.latency = latency
+
+    def delay(self, source: object | None, destination: object) -> int:
+        if source is None:
+            return 0
+        return self.latency
+
+
+class TierLatency(LatencyModel):
+    '''
+    A delay for each pair of tiers, in both directions, so the cloud can be farther than the fogs.
+    '''
+
+    def __init__(self, edge_fog: int, edge_cloud: int, fog_cloud: int):
+        # sorted pair of tiers -> delay
+        self.latencies: dict[tuple[str, str], int] = {
+            ('Edge', 'Fog'): edge_fog,
+            ('Cloud', 'Edge'): edge_cloud,
+            ('Cloud', 'Fog'): fog_cloud,
+        }
+
+    def delay(self, source: object | None, destination: object) -> int:
+        if source is None:
+            return 0
+        tiers = sorted([source.tier, destination.tier])
+        return self.latencies.get((tiers[0], tiers[1]), 0)
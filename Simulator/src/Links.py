@@ -0,0 +1,76 @@
+from EdgeApp.types.Cloud import Cloud as EdgeCloud
+from EdgeApp.types.Fog import Fog as EdgeFog
+from FogApp.types.Cloud import Cloud as FogCloud
+from FogApp.types.SubTask import SubTask as FogSubTask
+from Simulator.src.Transport import Transport
+
+
+class OffloadLink:
+    '''
+    Takes the place of the edge OffloadDispatcher behind Fog.offload and Cloud.offload: the offloaded task goes from
+    the edge to the pushTasks of the node in the url.
+    '''
+
+    def __init__(self, transport: Transport):
+        self.transport = transport
+
+    def dispatch(self, url: str, back_address: str, task: dict, description: str):
+        address = url.split('/')[2]
+        self.transport.send(back_address, address, 'push_tasks', back_address, [task])
+
+
+class NotificationLink:
+    '''
+    Takes the place of the NotificationBatcher behind Edge.notify on a fog or the cloud: every completion goes
+    straight from the node at source to the edge.
+    '''
+
+    def __init__(self, transport: Transport, source: str):
+        self.transport = transport
+        self.source = source
+
+    def notify(self, address: str, task_id: int, workflow_id: int, job_id: int):
+        self.transport.send(self.source, address, 'notify_execute_tasks', [(task_id, workflow_id, job_id)])
+
+
+class EdgeCloudLink(EdgeCloud):
+    '''
+    The cloud as an edge sees it, answering getNodes from the simulated fogs.
+    '''
+
+    def __init__(self, cloud_address: str, dispatcher: OffloadLink, fogs: list[dict]):
+        super().__init__(cloud_address, dispatcher)
+        self.fogs = fogs
+
+    def get_nodes(self):
+        return [EdgeFog(fog, self.dispatcher) for fog in self.fogs]
+
+    def register(self, back_address: str):
+        pass
+
+
+class FogCloudLink(FogCloud):
+    '''
+    The cloud as a fog sees it. The offloaded task keeps the absolute deadline it came with from the edge.
+    '''
+
+    def __init__(self, cloud_address: str, transport: Transport, source: str):
+        super().__init__(cloud_address)
+        self.transport = transport
+        self.source = source
+
+    def register(self, address: str, position_x: int, position_y: int, coverage_area: int):
+        pass
+
+    def offload(self, back_address: str, task: FogSubTask):
+        data = {
+            "id": task.id,
+            "workflowId": task.workflow_id,
+            "jobId": task.job_id,
+            "type": task.task_type.name,
+            "executionCost": task.execution_cost,
+            "memory": task.memory,
+            "absoluteDeadline": task.absolute_deadline_time
+        }
+        self.transport.send(self.source, self.address, 'push_tasks', back_address, [data])
+
@@ -0,0 +1,47 @@
+import math
+from abc import ABC, abstractmethod
+
+from Simulator.src.EventQueue import EventQueue
+from Simulator.src.VirtualClock import VirtualClock
+
+
+class Node(ABC):
+    '''
+    Runs the scheduling rounds of one device on the virtual clock. A round runs at the next event time its scheduler
+    returns or when a message arrives, and the last one right after the total time, like the device loop. A round
+    takes at least one ms.
+    '''
+
+    def __init__(self, address: str, clock: VirtualClock, events: EventQueue, total_time: int):
+        self.address = address
+        self.clock = clock
+        self.events = events
+        self.total_time = total_time
+        self.next_round: float = math.inf
+        self.stopped = False
+        self.rounds = 0
+
+    @abstractmethod
+    def schedule(self, current_time: int) -> float:
+        pass
+
+    def wake(self, t: int):
+        if self.stopped or t >= self.next_round:
+            return
+        self.next_round = t
+        self.events.push(t, self.round, t)
+
+    def round(self, t: int):
+        if t != self.next_round:
+            # an earlier wake took its place
+            return
+        self.next_round = math.inf
+        self.rounds += 1
+
+        next_event_time = self.schedule(t)
+        if t > self.total_time:
+            self.stopped = True
+            return
+
+        next_event_time = min(max(next_event_time, t + 1), self.total_time + 1)
+        self.wake(math.ceil(next_event_time))
@@ -0,0 +1,90 @@
+import os
+import random
+
+import numpy as np
+
+from Simulator.src.CloudNode import CloudNode
+from Simulator.src.EdgeNode import EdgeNode
+from Simulator.src.EventQueue import EventQueue
+from Simulator.src.FogNode import FogNode
+from Simulator.src.InMemoryTransport import InMemoryTransport
+from Simulator.src.LatencyModel import LatencyModel
+from Simulator.src.Links import EdgeCloudLink, FogCloudLink, NotificationLink, OffloadLink
+from Simulator.src.VirtualClock import VirtualClock
+
+
+class Simulation:
+    '''
+    One run of the whole system in one process: the cloud, fogs and edges of bash.sh with the schedulers of their
+    tiers, all on one virtual clock, and the messages between them delivered through an in-memory transport after
+    the delay of the latency model. The same seed gives the same run.
+    '''
+
+    def __init__(self, algorithm: str, fog_count: int, edge_count: int, total_time: int, scheduler_total_time: int,
+                 seed: int, latency_model: LatencyModel):
+        random.seed(seed)
+        np.random.seed(seed)
+
+        self.clock = VirtualClock()
+        self.events = EventQueue()
+        self.transport = InMemoryTransport(self.clock, self.events, latency_model)
+        offload_link = OffloadLink(self.transport)
+
+        cloud_address = "localhost:8200"
+        self.cloud = CloudNode(cloud_address, algorithm, self.clock, self.events,
+                               NotificationLink(self.transport, cloud_address), total_time)
+        self.transport.register(self.cloud.address, self.cloud)
+
+        self.fogs: list[FogNode] = []
+        for i in range(fog_count):
+            fog_address = f"localhost:{8100 + i}"
+            fog = FogNode(fog_address, i % 4, algorithm, self.clock, self.events,
+                          FogCloudLink(self.cloud.address, self.transport, fog_address),
+                          NotificationLink(self.transport, fog_address), total_time)
+            self.transport.register(fog.address, fog)
+            self.fogs.append(fog)
+
+        fogs = [fog.dto() for fog in self.fogs]
+        self.edges: list[EdgeNode] = []
+        for i in range(edge_count):
+            edge = EdgeNode(f"localhost:{8000 + i}", i % 7, algorithm, self.clock, self.events,
+                            EdgeCloudLink(self.cloud.address, offload_link, fogs), total_time, scheduler_total_time)
+            self.transport.register(edge.address, edge)
+            self.edges.append(edge)
+
+    def run(self, dags: list[dict], periodic_tasks: list[dict]) -> int:
+        '''
+        Starts every node, submits the tasks to every edge and runs the events until all nodes stopped.
+
+        Returns:
+        The number of events run.
+        '''
+        self.cloud.start()
+        for fog in self.fogs:
+            fog.start()
+        for edge in self.edges:
+            edge.start()
+            self.transport.send(None, edge.address, 'push_dags', dags)
+            self.transport.send(None, edge.address, 'push_periodic_tasks', periodic_tasks)
+
+        count = 0
+        while len(self.events) > 0:
+            t, callback, args = self.events.pop()
+            self.clock.advance(t)
+            callback(*args)
+            count += 1
+
+        return count
+
+    def result(self, results_path: str, output_name: str):
+        '''
+        Writes the result files of every node the way the devices do, under results_path/Cloud, Fog and Edge.
+        '''
+        for tier in ['Cloud', 'Fog', 'Edge']:
+            os.makedirs(f'{results_path}/{tier}', exist_ok=True)
+
+        self.cloud.result(f'{results_path}/Cloud', output_name)
+        for i in range(len(self.fogs)):
+            self.fogs[i].result(f'{results_path}/Fog', f'{output_name}-{i}')
+        for i in range(len(self.edges)):
+            self.edges[i].result(f'{results_path}/Edge', f'{output_name}-{i}')
@@ -0,0 +1,17 @@
+from abc import ABC, abstractmethod
+
+
+class Transport(ABC):
+    '''
+    Carries the calls between the nodes of the harness in place of the HTTP APIs of the devices. A message calls the
+    method of the same name on the node registered at the address, from the node at source, None for the harness
+    itself.
+    '''
+
+    @abstractmethod
+    def register(self, address: str, node: object):
+        pass
+
+    @abstractmethod
+    def send(self, source: str | None, address: str, method: str, *args):
+        pass
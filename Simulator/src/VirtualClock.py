@@ -0,0 +1,15 @@
+class VirtualClock:
+    '''
+    Simulated time in ms. time() reads it in seconds, the way the schedulers read the wall clock.
+    '''
+
+    def __init__(self):
+        self.now: int = 0
+
+    def time(self) -> float:
+        return self.now / 1000
+
+    def advance(self, t: int):
+        if t < self.now:
+            raise ValueError(f"The clock cannot go back from {self.now} to {t}.")
+        self.now = t
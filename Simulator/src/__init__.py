@@ -0,0 +1,20 @@
+import importlib.util
+import os
+import sys
+
+# the tiers are separate Django projects, their apps are imported as top-level packages
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+for tier in ['Edge', 'Fog', 'Cloud']:
+    path = os.path.join(ROOT, tier)
+    if path not in sys.path:
+        sys.path.append(path)
+
+
+def load_module(name: str, path: str):
+    '''
+    Loads a module from its file without importing its package.
+    '''
+    spec = importlib.util.spec_from_file_location(name, os.path.join(ROOT, path))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module